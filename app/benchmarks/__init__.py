@@ -0,0 +1 @@
+"""Micro-benchmarks for core hot paths. Run from the app directory, e.g. `python -m benchmarks.bench_bus`."""
@@ -0,0 +1,200 @@
+"""
+Event bus micro-benchmarks.
+
+    cd app
+    python -m benchmarks.bench_bus                       # print results
+    python -m benchmarks.bench_bus --save base.json      # write a baseline
+    python -m benchmarks.bench_bus --compare base.json   # exit 1 on regression
+
+Every benchmark runs against a fresh GlobalEventBus inside a running event loop,
+so the global `bus` and its subscribers are not involved.
+"""
+import asyncio
+import contextlib
+import logging
+import os
+import time
+from typing import Dict
+
+from benchmarks.common import build_parser, finish, latency_percentiles, measure, measure_async
+from core.bus import GlobalEventBus
+from core.logger import FORMAT_STR, EnterpriseFormatter, RingBufferHandler
+
+SUBSCRIBER_COUNTS = (1, 10, 100)
+INVENTORY_HOSTS = 5000
+
+
+@contextlib.contextmanager
+def bus_logging(bus: GlobalEventBus, enabled: bool):
+    """Routes the bus logger to production-like handlers (devnull + ring buffer) or silences it."""
+    logger = bus.log
+    saved = (logger.level, logger.handlers[:], logger.propagate)
+    devnull = open(os.devnull, "w")
+    try:
+        logger.handlers = []
+        logger.propagate = False
+        if enabled:
+            formatter = EnterpriseFormatter(FORMAT_STR, datefmt="%H:%M:%S")
+            for handler in (logging.StreamHandler(devnull), RingBufferHandler()):
+                handler.setFormatter(formatter)
+                logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+        else:
+            logger.setLevel(logging.WARNING)
+        yield
+    finally:
+        logger.setLevel(saved[0])
+        logger.handlers = saved[1]
+        logger.propagate = saved[2]
+        devnull.close()
+
+
+def inventory_payload(hosts: int) -> dict:
+    return {
+        "source": "bench",
+        "hosts": [
+            {
+                "name": f"host-{index:05d}",
+                "ip": f"10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}",
+                "os": "linux",
+                "tags": ["prod", "web"],
+                "metrics": {"cpu": 12.5, "mem": 48.1, "disk": 71.0},
+            }
+            for index in range(hosts)
+        ],
+    }
+
+
+async def drain(bus: GlobalEventBus):
+    """Waits for queued events and handler tasks; long-lived pool/lane workers are skipped."""
+    for pool in bus._pools.values():
+        await pool.queue.join()
+    while True:
+        pending = [t for t in bus._active_tasks if not t.get_name().startswith(("bus:pool:", "bus:lane:"))]
+        if not pending:
+            return
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def bench_emit_sync(count: int, iterations: int) -> Dict:
+    bus = GlobalEventBus()
+    for _ in range(count):
+        bus.subscribe("bench:sync")(lambda payload: None)
+    payload = {"value": 1}
+
+    with bus_logging(bus, enabled=False):
+        result = measure(lambda: bus.emit("bench:sync", payload), iterations)
+        latencies = []
+        for _ in range(min(iterations, 2000)):
+            start = time.perf_counter()
+            bus.emit("bench:sync", payload)
+            latencies.append(time.perf_counter() - start)
+    return {**result, **latency_percentiles(latencies)}
+
+
+async def bench_emit_async(count: int, iterations: int, batch: int = 100) -> Dict:
+    """Emit plus task scheduling and completion of `count` async handlers, per event."""
+    bus = GlobalEventBus()
+
+    async def handler(payload):
+        return None
+
+    for _ in range(count):
+        bus.subscribe("bench:async")(handler)
+    payload = {"value": 1}
+
+    async def burst():
+        for _ in range(batch):
+            bus.emit("bench:async", payload)
+        await drain(bus)
+
+    with bus_logging(bus, enabled=False):
+        return await measure_async(burst, max(1, iterations // batch), ops_per_call=batch)
+
+
+async def bench_emit_many(count: int, iterations: int, batch: int = 100) -> Dict:
+    """Per-event cost of emit_many() with `count` async handlers (compare with emit_async_*)."""
+    bus = GlobalEventBus()
+
+    async def handler(payload):
+        return None
+
+    for _ in range(count):
+        bus.subscribe("bench:batch")(handler)
+    payloads = [{"value": index} for index in range(batch)]
+
+    async def burst():
+        bus.emit_many("bench:batch", payloads, readonly=True)
+        await drain(bus)
+
+    with bus_logging(bus, enabled=False):
+        return await measure_async(burst, max(1, iterations // batch), ops_per_call=batch)
+
+
+async def bench_create_tracked_task(iterations: int, batch: int = 100) -> Dict:
+    bus = GlobalEventBus()
+
+    async def noop():
+        return None
+
+    async def burst():
+        tasks = [bus.create_tracked_task(noop(), name="bench:noop") for _ in range(batch)]
+        await asyncio.gather(*tasks)
+
+    return await measure_async(burst, max(1, iterations // batch), ops_per_call=batch)
+
+
+async def bench_inventory_emit(summarized: bool, iterations: int) -> Dict:
+    """Cost of emitting a large inventory payload with INFO event logging enabled."""
+    bus = GlobalEventBus()
+    topic = "monitoring:inventory_sync" if summarized else "bench:inventory"
+    bus.subscribe(topic)(lambda payload: None)
+    payload = inventory_payload(INVENTORY_HOSTS)
+
+    with bus_logging(bus, enabled=True):
+        result = measure(lambda: bus.emit(topic, payload), iterations, repeat=3)
+    await drain(bus)
+    for pooled_topic in list(bus._pools):
+        bus.remove_pool(pooled_topic)
+    return result
+
+
+async def bench_logging_overhead(enabled: bool, iterations: int) -> Dict:
+    """One sync subscriber, small payload; the difference between on/off is the EVENT log line."""
+    bus = GlobalEventBus()
+    bus.subscribe("bench:logged")(lambda payload: None)
+    payload = {"host": "web-01", "status": "up", "token": "abc123"}
+
+    with bus_logging(bus, enabled=enabled):
+        return measure(lambda: bus.emit("bench:logged", payload), iterations)
+
+
+async def run(args) -> Dict[str, Dict]:
+    scale = 10 if args.quick else 1
+    suite = {}
+    for count in SUBSCRIBER_COUNTS:
+        suite[f"emit_sync_{count}_subs"] = lambda c=count: bench_emit_sync(c, 20000 // c // scale + 10)
+        suite[f"emit_async_{count}_subs"] = lambda c=count: bench_emit_async(c, 20000 // c // scale + 100)
+        suite[f"emit_many_async_{count}_subs"] = lambda c=count: bench_emit_many(c, 20000 // c // scale + 100)
+    suite["create_tracked_task"] = lambda: bench_create_tracked_task(20000 // scale)
+    suite[f"emit_inventory_{INVENTORY_HOSTS}_hosts_summarized"] = lambda: bench_inventory_emit(True, 50 // scale + 1)
+    suite[f"emit_inventory_{INVENTORY_HOSTS}_hosts_full_repr"] = lambda: bench_inventory_emit(False, 20 // scale + 1)
+    suite["emit_logging_off"] = lambda: bench_logging_overhead(False, 20000 // scale)
+    suite["emit_logging_on"] = lambda: bench_logging_overhead(True, 20000 // scale)
+
+    results = {}
+    for name, factory in suite.items():
+        if args.filter and args.filter not in name:
+            continue
+        results[name] = await factory()
+    return results
+
+
+def main():
+    args = build_parser("Event bus micro-benchmarks").parse_args()
+    results = asyncio.run(run(args))
+    finish("bus", results, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Log formatting micro-benchmarks: per-record cost of EnterpriseFormatter.
+
+    cd app
+    python -m benchmarks.bench_logging
+    python -m benchmarks.bench_logging --save log-base.json
+    python -m benchmarks.bench_logging --compare log-base.json
+
+Production attaches one formatter to three handlers (console, file, UI ring
+buffer), so the `*_3_handlers` cases format each record three times. The
+`legacy_*` cases use the previous per-key re.sub masking for comparison.
+"""
+import logging
+import re
+
+from benchmarks.common import build_parser, finish, measure
+from core.logger import DATE_FORMAT, FORMAT_STR, EnterpriseFormatter
+
+
+class LegacyEnterpriseFormatter(logging.Formatter):
+    """The formatter before single-pass masking: one re.sub per key, on every handler."""
+    SENSITIVE_KEYS = EnterpriseFormatter.SENSITIVE_KEYS
+
+    def format(self, record):
+        if record.args and isinstance(record.msg, str):
+            record.msg = record.getMessage()
+            record.args = None
+        if isinstance(record.msg, str):
+            for key in self.SENSITIVE_KEYS:
+                pattern = rf"({key}['\" ]*[:=][ '\" ]*)([^ '\",\n]+)"
+                record.msg = re.sub(pattern, r"\1********", record.msg, flags=re.IGNORECASE)
+        return super().format(record)
+
+
+SAMPLES = {
+    "plain": ("SUCCESS: Module 'lyndrix.plugin.discord' is now ACTIVE", None),
+    "secrets": ("GIT: Cloning with x-gitlab-token: glpat-123456 and password='hunter2' for user admin", None),
+    "event": ("EVENT: %s | Data: %s", ("monitoring:state_changed",
+                                       {"monitor_id": 42, "transition": "UP->DOWN", "token": "abc",
+                                        "error_message": "connection refused " * 4})),
+}
+
+
+def make_record(msg, args):
+    return logging.LogRecord("Plugin:Bench", logging.INFO, __file__, 1, msg, args, None)
+
+
+def bench(formatter_cls, sample: str, handlers: int, iterations: int):
+    formatter = formatter_cls(FORMAT_STR, datefmt=DATE_FORMAT)
+    msg, args = SAMPLES[sample]
+
+    def run():
+        record = make_record(msg, args)
+        for _ in range(handlers):
+            formatter.format(record)
+
+    return measure(run, iterations)
+
+
+def main():
+    parser = build_parser("Log formatting micro-benchmarks")
+    parser.add_argument("--records-per-sec", type=int, default=200,
+                        help="log volume used to project CPU cost (default: 200 records/s)")
+    args = parser.parse_args()
+    iterations = 2000 if args.quick else 20000
+
+    results = {}
+    for sample in SAMPLES:
+        for handlers in (1, 3):
+            for label, formatter_cls in (("legacy", LegacyEnterpriseFormatter), ("current", EnterpriseFormatter)):
+                name = f"{label}_{sample}_{handlers}_handlers"
+                if args.filter and args.filter not in name:
+                    continue
+                result = bench(formatter_cls, sample, handlers, iterations)
+                # CPU milliseconds per second of wall time spent formatting at the given volume
+                result["cpu_ms_per_s"] = round(result["mean_us"] * args.records_per_sec / 1000, 3)
+                results[name] = result
+    finish("logging", results, args)
+
+
+if __name__ == "__main__":
+    main()
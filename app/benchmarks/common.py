@@ -0,0 +1,124 @@
+"""
+Shared helpers for the benchmark scripts: timing, result records, JSON
+baselines and regression comparison.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+
+def measure(fn: Callable[[], None], iterations: int, repeat: int = 5, ops_per_call: int = 1) -> Dict:
+    """Calls `fn` `iterations` times per round for `repeat` rounds; reports per-op timings in microseconds."""
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        samples.append((time.perf_counter() - start) / (iterations * ops_per_call))
+    return summarize(samples, iterations * ops_per_call * repeat)
+
+
+async def measure_async(fn, iterations: int, repeat: int = 5, ops_per_call: int = 1) -> Dict:
+    """Async variant of measure(); `fn` is a coroutine function."""
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await fn()
+        samples.append((time.perf_counter() - start) / (iterations * ops_per_call))
+    return summarize(samples, iterations * ops_per_call * repeat)
+
+
+def summarize(per_op_seconds: List[float], operations: int) -> Dict:
+    """Per-round mean op time -> result record. `mean_us` is what comparisons use."""
+    ordered = sorted(per_op_seconds)
+    mean = statistics.mean(ordered)
+    return {
+        "operations": operations,
+        "mean_us": round(mean * 1e6, 3),
+        "min_us": round(ordered[0] * 1e6, 3),
+        "max_us": round(ordered[-1] * 1e6, 3),
+        "stdev_us": round(statistics.pstdev(ordered) * 1e6, 3),
+        "ops_per_sec": round(1 / mean) if mean else None,
+    }
+
+
+def latency_percentiles(latencies: List[float]) -> Dict:
+    """p50/p95/p99 in microseconds for individually timed operations."""
+    ordered = sorted(latencies)
+
+    def pick(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1e6, 3)
+
+    return {"p50_us": pick(0.5), "p95_us": pick(0.95), "p99_us": pick(0.99)}
+
+
+def environment() -> Dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except Exception:
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def build_parser(description: str) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a saved JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="relative slowdown of mean_us reported as a regression (default: 0.15)")
+    parser.add_argument("--quick", action="store_true", help="fewer iterations, for smoke runs")
+    parser.add_argument("--filter", metavar="TEXT", help="only run benchmarks whose name contains TEXT")
+    return parser
+
+
+def print_results(results: Dict[str, Dict]):
+    width = max((len(name) for name in results), default=10)
+    print(f"{'benchmark':<{width}}  {'mean_us':>10}  {'ops/s':>12}  {'p95_us':>10}")
+    for name, result in results.items():
+        p95 = result.get("p95_us")
+        print(f"{name:<{width}}  {result['mean_us']:>10.3f}  {result['ops_per_sec'] or 0:>12,}  "
+              f"{'' if p95 is None else f'{p95:.3f}':>10}")
+
+
+def compare(results: Dict[str, Dict], baseline_path: str, threshold: float) -> bool:
+    """Prints a comparison table; returns True if any benchmark regressed beyond `threshold`."""
+    with open(baseline_path, encoding="utf-8") as handle:
+        baseline = json.load(handle).get("results", {})
+
+    regressed = False
+    print(f"\nComparison with {baseline_path} (threshold {threshold:.0%})")
+    for name, result in results.items():
+        before: Optional[Dict] = baseline.get(name)
+        if not before or not before.get("mean_us"):
+            print(f"  {name}: new")
+            continue
+        change = result["mean_us"] / before["mean_us"] - 1
+        verdict = "REGRESSION" if change > threshold else ("improved" if change < -threshold else "ok")
+        regressed |= change > threshold
+        print(f"  {name}: {before['mean_us']:.3f} -> {result['mean_us']:.3f} us ({change:+.1%}) {verdict}")
+    return regressed
+
+
+def finish(suite: str, results: Dict[str, Dict], args: argparse.Namespace):
+    """Prints, saves and compares results; exits non-zero on regression."""
+    print_results(results)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as handle:
+            json.dump({"suite": suite, "environment": environment(), "results": results}, handle, indent=2)
+        print(f"\nBaseline written to {args.save}")
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
@@ -35,6 +35,16 @@ class Settings(BaseSettings):
     DB_USER: str = "admin"
     DB_PASSWORD: str = "secret"
     DB_NAME: str = "lyndrix_db"
+    # Connection pool, applied to both the sync and the async engine
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # Seconds after which a pooled connection is replaced (below MariaDB's wait_timeout); -1 disables
+    DB_POOL_RECYCLE: int = 1800
+    # Seconds a checkout waits for a free connection before failing
+    DB_POOL_TIMEOUT: int = 30
+    DB_CONNECT_TIMEOUT: int = 5
+    # Connections opened per engine when the database connects, so first requests skip the handshake
+    DB_POOL_WARMUP: int = 2
 
     # --- BOOTSTRAP CREDENTIALS ---
     LYNDRIX_ADMIN_USER: str = "admin"
@@ -53,6 +63,27 @@ class Settings(BaseSettings):
     LYNDRIX_ARGON_MEM: int = 65536
     LYNDRIX_ARGON_PARALLEL: int = 4
 
+    # --- EVENT BUS ---
+    # Run synchronous bus subscribers in a thread pool instead of on the event loop
+    BUS_OFFLOAD_SYNC_HANDLERS: bool = False
+    BUS_SYNC_WORKERS: int = 4
+    # Handlers exceeding these budgets are logged and reported via 'bus:slow_handler'
+    BUS_SLOW_SYNC_HANDLER_MS: int = 50
+    BUS_SLOW_ASYNC_HANDLER_MS: int = 5000
+    # Max share of event loop time for low-priority (telemetry) topics, and their queue size
+    BUS_LOW_PRIORITY_SHARE: float = 0.25
+    BUS_LOW_PRIORITY_QUEUE: int = 10000
+    # Forward selected topics between worker processes over a local Unix socket broker
+    BUS_BRIDGE_ENABLED: bool = False
+    BUS_BRIDGE_SOCKET: str = "/tmp/lyndrix-bus.sock"
+    # Comma-separated topics or patterns; sensitive topics are never forwarded. vault:opened and
+    # db:connected are left out: every worker emits them itself, and a forwarded copy would rebuild
+    # engines or run DB init in a worker whose own connection may be down.
+    BUS_BRIDGE_TOPICS: str = (
+        "vault:ready_for_data,system:maintenance_mode,"
+        "plugin:files_changed,ui:needs_refresh,system:notify"
+    )
+
     # --- PLUGIN RECONCILIATION ---
     # Comma-separated list of plugin specs to auto-install on first boot.
     # Format: https://github.com/org/repo[@version]
@@ -69,11 +100,19 @@ class Settings(BaseSettings):
     def DATABASE_URL(self) -> str:
         return f"mysql+pymysql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}/{self.DB_NAME}"
 
+    @property
+    def DATABASE_URL_ASYNC(self) -> str:
+        return f"mysql+aiomysql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}/{self.DB_NAME}"
+
     @property
     def DATABASE_URL_SAFE(self) -> str:
         """Connection string with credentials redacted for logging."""
         return f"mysql+pymysql://{self.DB_USER}:***@{self.DB_HOST}/{self.DB_NAME}"
 
+    @property
+    def bus_bridge_topics(self) -> List[str]:
+        return [topic.strip() for topic in self.BUS_BRIDGE_TOPICS.split(",") if topic.strip()]
+
     @property
     def LYNDRIX_VAULT_KEY_FILE(self) -> str:
         return f"{self.SECURITY_DIR}/vault_keys.enc"
@@ -6,20 +6,31 @@ core.components.* internals. Breaking changes will bump __api_version__.
 """
 __api_version__ = "1.0.0"
 
-from core.bus import bus as event_bus, GlobalEventBus
+from core.bus import (
+    bus as event_bus, GlobalEventBus, BusRequestTimeout, NoResponderError,
+    ReadOnlyMapping, ReadOnlySequence, readonly_view,
+)
 from core.logger import get_logger
 from core.components.plugins.logic.models import ModuleManifest, ModulePermissions
-from core.components.plugins.logic.context import ModuleContext
+from core.components.plugins.logic.context import ModuleContext, TaskQuotaExceeded
 from core.components.database.logic.db_service import db_instance, Base
+from core.components.database.logic.migrations import Migration
 
 __all__ = [
     "__api_version__",
     "event_bus",
     "GlobalEventBus",
+    "BusRequestTimeout",
+    "NoResponderError",
+    "ReadOnlyMapping",
+    "ReadOnlySequence",
+    "readonly_view",
     "get_logger",
     "ModuleManifest",
     "ModulePermissions",
     "ModuleContext",
+    "TaskQuotaExceeded",
     "db_instance",
     "Base",
+    "Migration",
 ]
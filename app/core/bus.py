@@ -1,80 +1,1557 @@
 import asyncio
+import copy
 import inspect
+import logging
+import time
 import weakref
-from typing import Dict, List, Callable, Set
+from collections import deque
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Callable, Set, Optional, Tuple
 from core.logger import get_logger
+from core.metrics import LatencyHistogram
+
+# Backpressure policies for topics dispatched through a bounded worker pool
+OVERFLOW_BLOCK = "block"
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_DROP_NEWEST = "drop_newest"
+OVERFLOW_POLICIES = (OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEWEST)
+
+# Priority lanes: critical handlers are never queued behind telemetry; low-priority
+# events are drained by a single task that yields to critical work and is capped
+# to a share of loop time.
+PRIORITY_CRITICAL = "critical"
+PRIORITY_NORMAL = "normal"
+PRIORITY_LOW = "low"
+PRIORITY_LANES = (PRIORITY_CRITICAL, PRIORITY_NORMAL, PRIORITY_LOW)
+# Longest a low-priority slice waits for in-flight critical handlers. Critical
+# handlers that are awaiting I/O (or run for minutes) must not freeze telemetry.
+CRITICAL_MAX_WAIT_SECONDS = 0.05
+
+# Topic patterns: segments are split on ':'; '*' matches exactly one segment,
+# '**' matches zero or more trailing segments (e.g. 'monitoring:*', 'plugin:**').
+# Subscriptions only accept '**' as the last segment.
+TOPIC_SEPARATOR = ":"
+WILDCARD_ONE = "*"
+WILDCARD_REST = "**"
+
+
+def is_topic_pattern(topic: str) -> bool:
+    """True if `topic` contains a wildcard segment."""
+    return any(seg in (WILDCARD_ONE, WILDCARD_REST) for seg in topic.split(TOPIC_SEPARATOR))
+
+
+def _check_subscription_pattern(pattern: str):
+    """Raises ValueError unless '**' only appears as the last segment."""
+    segments = pattern.split(TOPIC_SEPARATOR)
+    if WILDCARD_REST in segments[:-1]:
+        raise ValueError(f"Invalid topic pattern '{pattern}': '**' must be the last segment")
+
+
+def topic_matches(pattern: str, topic: str) -> bool:
+    """Segment-wise match of `topic` against `pattern`.
+
+    `topic` may itself be a pattern; its wildcards are then compared literally,
+    so 'plugin:**' covers 'plugin:*' but 'monitoring:state_changed' does not.
+    """
+    if pattern == topic:
+        return True
+    return _match_segments(pattern.split(TOPIC_SEPARATOR), topic.split(TOPIC_SEPARATOR))
+
+
+def _loop_running() -> bool:
+    """True when called from a thread with a running event loop (pools and lanes need one)."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _match_segments(pattern: List[str], topic: List[str]) -> bool:
+    if not pattern:
+        return not topic
+    head = pattern[0]
+    if head == WILDCARD_REST:
+        return any(_match_segments(pattern[1:], topic[i:]) for i in range(len(topic) + 1))
+    if not topic:
+        return False
+    # A '*' rule never covers a requested '**' segment: that would widen one level to any depth
+    if head == topic[0] or (head == WILDCARD_ONE and topic[0] != WILDCARD_REST):
+        return _match_segments(pattern[1:], topic[1:])
+    return False
+
+
+class _TrieNode:
+    __slots__ = ("children", "callbacks", "rest_callbacks")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        # Patterns ending exactly at this node
+        self.callbacks: List[Callable] = []
+        # Patterns ending in '**' below this node (match any remaining suffix)
+        self.rest_callbacks: List[Callable] = []
+
+
+class _TopicTrie:
+    """Segment trie of wildcard subscriptions; matching costs O(topic depth)."""
+
+    def __init__(self):
+        self.root = _TrieNode()
+        self.size = 0
+
+    def add(self, pattern: str, callback: Callable):
+        _check_subscription_pattern(pattern)
+        node = self.root
+        for segment in pattern.split(TOPIC_SEPARATOR):
+            if segment == WILDCARD_REST:
+                node.rest_callbacks.append(callback)
+                self.size += 1
+                return
+            node = node.children.setdefault(segment, _TrieNode())
+        node.callbacks.append(callback)
+        self.size += 1
+
+    def remove(self, pattern: str, callback: Callable) -> bool:
+        """Removes one registration of `callback` for `pattern`, pruning emptied nodes."""
+        path = [self.root]
+        for segment in pattern.split(TOPIC_SEPARATOR):
+            if segment == WILDCARD_REST:
+                bucket = path[-1].rest_callbacks
+                break
+            child = path[-1].children.get(segment)
+            if child is None:
+                return False
+            path.append(child)
+        else:
+            bucket = path[-1].callbacks
+
+        if callback not in bucket:
+            return False
+        bucket.remove(callback)
+        self.size -= 1
+
+        segments = pattern.split(TOPIC_SEPARATOR)
+        for depth in range(len(path) - 1, 0, -1):
+            node = path[depth]
+            if node.children or node.callbacks or node.rest_callbacks:
+                break
+            del path[depth - 1].children[segments[depth - 1]]
+        return True
+
+    def match(self, topic: str) -> List[Callable]:
+        matched: List[Callable] = []
+        frontier = [self.root]
+        for segment in topic.split(TOPIC_SEPARATOR):
+            next_frontier = []
+            for node in frontier:
+                matched.extend(node.rest_callbacks)
+                for key in (segment, WILDCARD_ONE):
+                    child = node.children.get(key)
+                    if child is not None:
+                        next_frontier.append(child)
+            frontier = next_frontier
+            if not frontier:
+                return matched
+        for node in frontier:
+            matched.extend(node.rest_callbacks)
+            matched.extend(node.callbacks)
+        return matched
+
+
+def _weak_handler(callback: Callable, on_dead: Callable[[Callable], None]) -> Callable:
+    """Wraps `callback` so the bus only holds a weak reference to it (and its instance).
+
+    Once the target is garbage collected the wrapper becomes a no-op and `on_dead`
+    is called with the wrapper so the bus can drop the subscription.
+    """
+    def _collected(_ref):
+        on_dead(handler)
+
+    if inspect.ismethod(callback):
+        ref = weakref.WeakMethod(callback, _collected)
+        target_function = callback.__func__
+    else:
+        ref = weakref.ref(callback, _collected)
+        target_function = callback
+
+    if inspect.iscoroutinefunction(callback):
+        async def handler(payload):
+            target = ref()
+            if target is not None:
+                return await target(payload)
+    else:
+        def handler(payload):
+            target = ref()
+            if target is not None:
+                return target(payload)
+
+    handler.__name__ = getattr(target_function, "__name__", "handler")
+    handler.__qualname__ = getattr(target_function, "__qualname__", handler.__name__)
+    handler.__module__ = getattr(target_function, "__module__", None)
+    handler.__bus_ref__ = ref
+    return handler
+
+
+def _batch_handler(callback: Callable) -> Callable:
+    """Adapts a batch subscriber (takes a tuple of payloads) to single emits.
+
+    emit_many() calls the target in `__bus_batch__` once with the whole batch.
+    """
+    if inspect.iscoroutinefunction(callback):
+        async def handler(payload):
+            return await callback((payload,))
+    else:
+        def handler(payload):
+            return callback((payload,))
+
+    handler.__name__ = callback.__name__
+    handler.__qualname__ = getattr(callback, "__qualname__", callback.__name__)
+    handler.__module__ = getattr(callback, "__module__", None)
+    handler.__bus_batch__ = callback
+    return handler
+
+
+def _same_callback(registered: Callable, callback: Callable) -> bool:
+    """True if `registered` is `callback` or a weak/batch wrapper around it."""
+    if registered == callback:
+        return True
+    inner = getattr(registered, "__bus_batch__", None)
+    if inner is not None:
+        return _same_callback(inner, callback)
+    ref = getattr(registered, "__bus_ref__", None)
+    return ref is not None and ref() == callback
+
+
+class ReadOnlyMapping(Mapping):
+    """Read-only view of a payload dict; nested dicts and lists are wrapped lazily on access.
+
+    Lets every subscriber share one payload without defensive copies. Use copy()
+    for a mutable shallow copy, or copy.deepcopy() for a fully independent one.
+    """
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Mapping):
+        self._data = data
+
+    def __getitem__(self, key):
+        return readonly_view(self._data[key])
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return repr(self._data)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(self._data, memo)
+
+    def copy(self) -> dict:
+        return dict(self._data)
+
+
+class ReadOnlySequence(Sequence):
+    """Read-only view of a list or tuple inside a payload."""
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Sequence):
+        self._data = data
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ReadOnlySequence(self._data[index])
+        return readonly_view(self._data[index])
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return repr(self._data)
+
+    def __eq__(self, other):
+        if isinstance(other, ReadOnlySequence):
+            other = other._data
+        return list(self._data) == list(other) if isinstance(other, (list, tuple)) else NotImplemented
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(self._data, memo)
+
+
+def readonly_view(value: Any) -> Any:
+    """Wraps dicts and lists in read-only views; other values are returned as-is."""
+    if isinstance(value, Mapping) and not isinstance(value, ReadOnlyMapping):
+        return ReadOnlyMapping(value)
+    if isinstance(value, (list, tuple)):
+        return ReadOnlySequence(value)
+    return value
+
+
+class _TopicWorkerPool:
+    """Bounded per-topic queue drained by a fixed number of consumer tasks.
+
+    Replaces one-task-per-emit dispatch for bursty topics, so an event storm
+    grows a bounded queue instead of the number of scheduled tasks.
+    """
+
+    def __init__(self, bus: "GlobalEventBus", topic: str, workers: int, maxsize: int, overflow: str):
+        self.bus = bus
+        self.topic = topic
+        self.workers = workers
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+        self.processed = 0
+        self._worker_tasks: List[asyncio.Task] = []
+
+    def _ensure_workers(self):
+        """Starts consumer tasks lazily; requires a running event loop."""
+        self._worker_tasks = [t for t in self._worker_tasks if not t.done()]
+        for index in range(len(self._worker_tasks), self.workers):
+            self._worker_tasks.append(
+                self.bus.create_tracked_task(self._worker(), name=f"bus:pool:{self.topic}:{index}")
+            )
+
+    def submit_nowait(self, payload: dict) -> bool:
+        """Enqueues without waiting. Returns False if the event was dropped."""
+        self._ensure_workers()
+        if self.queue.full():
+            if self.overflow == OVERFLOW_DROP_OLDEST:
+                self.queue.get_nowait()
+                self.queue.task_done()
+                self.dropped += 1
+            else:
+                # drop_newest, or block requested from a synchronous emit() that cannot wait
+                self.dropped += 1
+                if self.overflow == OVERFLOW_BLOCK:
+                    self.bus.log.warning(
+                        f"BACKPRESSURE: Queue for '{self.topic}' full ({self.maxsize}); "
+                        f"use emit_async() to block. Event dropped."
+                    )
+                return False
+        self.queue.put_nowait(payload)
+        return True
+
+    async def put(self, payload: dict) -> bool:
+        """Enqueues honouring the overflow policy; waits for space under 'block'."""
+        if self.overflow != OVERFLOW_BLOCK:
+            return self.submit_nowait(payload)
+        self._ensure_workers()
+        await self.queue.put(payload)
+        return True
+
+    async def _worker(self):
+        while True:
+            payload = await self.queue.get()
+            if self.bus._priority_of(self.topic) == PRIORITY_LOW:
+                await self.bus._yield_to_critical()
+            try:
+                await self.bus._dispatch_inline(self.topic, payload)
+            finally:
+                self.processed += 1
+                self.queue.task_done()
+
+    def stats(self) -> dict:
+        return {
+            "depth": self.queue.qsize(),
+            "maxsize": self.maxsize,
+            "workers": self.workers,
+            "overflow": self.overflow,
+            "dropped": self.dropped,
+            "processed": self.processed,
+        }
+
+    def stop(self):
+        for task in self._worker_tasks:
+            task.cancel()
+        self._worker_tasks = []
+
+
+class _LowPriorityLane:
+    """Single drainer for low-priority events.
+
+    Runs handlers in slices of at most `slice` seconds and then sleeps long enough
+    that the lane uses no more than `share` of loop time. While critical handlers
+    are in flight, each slice waits up to CRITICAL_MAX_WAIT_SECONDS for them and
+    yields to them between events.
+    """
+
+    def __init__(self, bus: "GlobalEventBus", share: float = 0.25, maxsize: int = 10000,
+                 slice_seconds: float = 0.005):
+        self.bus = bus
+        self.share = share
+        self.slice = slice_seconds
+        self.queue: deque = deque(maxlen=maxsize)
+        self.dropped = 0
+        self.processed = 0
+        self.throttled_ms = 0.0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def submit(self, topic: str, payload: dict):
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1
+        self.queue.append((topic, payload))
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = self.bus.create_tracked_task(self._drain(), name="bus:lane:low")
+        self._wakeup.set()
+
+    async def _drain(self):
+        while True:
+            if not self.queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            await self.bus._yield_to_critical()
+
+            busy = 0.0
+            while self.queue and busy < self.slice:
+                topic, payload = self.queue.popleft()
+                started = time.perf_counter()
+                try:
+                    await self.bus._dispatch_inline(topic, payload)
+                finally:
+                    self.processed += 1
+                    busy += time.perf_counter() - started
+                if self.bus._critical_in_flight:
+                    # Ready critical callbacks run before the next low-priority event
+                    await asyncio.sleep(0)
+
+            pause = busy * (1 - self.share) / self.share
+            self.throttled_ms += pause * 1000
+            # Always yield at least once so queued normal/critical callbacks run first
+            await asyncio.sleep(pause)
+
+    def stats(self) -> dict:
+        return {
+            "depth": len(self.queue),
+            "maxsize": self.queue.maxlen,
+            "share": self.share,
+            "dropped": self.dropped,
+            "processed": self.processed,
+            "throttled_ms": round(self.throttled_ms, 3),
+        }
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+class BusRequestError(Exception):
+    """Base class for request/reply failures on the event bus."""
+
+
+class NoResponderError(BusRequestError, LookupError):
+    """Raised when bus.request() targets a topic nobody responds to."""
+
+
+class BusRequestTimeout(BusRequestError, TimeoutError):
+    """Raised when no responder replied within the request timeout."""
+
+
+# Coalescing modes: 'latest' delivers the newest payload once per window,
+# 'debounce' delivers once the topic has been quiet for the window.
+COALESCE_LATEST = "latest"
+COALESCE_DEBOUNCE = "debounce"
+
+
+class _TopicCoalescer:
+    """Collapses bursts of one topic into a single delivery per window."""
+
+    def __init__(self, bus: "GlobalEventBus", topic: str, window: float, mode: str,
+                 merge: Optional[Callable[[dict, dict], dict]], max_wait: Optional[float]):
+        self.bus = bus
+        self.topic = topic
+        self.window = window
+        self.mode = mode
+        self.merge = merge
+        self.max_wait = max_wait
+        self.pending: Optional[dict] = None
+        self._pending_since = 0.0
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self.received = 0
+        self.delivered = 0
+
+    def push(self, payload: dict):
+        self.received += 1
+        if self.pending is None:
+            self.pending = payload
+            self._pending_since = time.monotonic()
+        elif self.merge is not None:
+            self.pending = self.merge(self.pending, payload)
+        else:
+            self.pending = payload
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop to schedule on (e.g. import time): deliver immediately
+            self.flush()
+            return
+
+        if self.mode == COALESCE_DEBOUNCE:
+            if self._handle is not None:
+                self._handle.cancel()
+            delay = self.window
+            if self.max_wait is not None:
+                waited = time.monotonic() - self._pending_since
+                delay = max(0.0, min(delay, self.max_wait - waited))
+            self._handle = loop.call_later(delay, self.flush)
+        elif self._handle is None:
+            self._handle = loop.call_later(self.window, self.flush)
+
+    def flush(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if self.pending is None:
+            return
+        payload, self.pending = self.pending, None
+        self.delivered += 1
+        self.bus._deliver(self.topic, payload)
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "window": self.window,
+            "received": self.received,
+            "delivered": self.delivered,
+            "pending": self.pending is not None,
+        }
+
+
+def _merge_refresh_reasons(previous: dict, current: dict) -> dict:
+    """Keeps every distinct reason of a coalesced ui:needs_refresh burst."""
+    reasons = (previous or {}).get("reason", "").split("; ")
+    reason = (current or {}).get("reason")
+    if reason and reason not in reasons:
+        reasons.append(reason)
+    return {**(current or {}), "reason": "; ".join(r for r in reasons if r)}
+
+
+def _summarize_inventory_sync(payload: dict) -> str:
+    return (
+        "{"
+        f"'owner_source': {payload.get('owner_source')!r}, "
+        f"'source_revision': {payload.get('source_revision')!r}, "
+        f"'hosts': {len(payload.get('hosts') or [])}, "
+        f"'services': {len(payload.get('services') or [])}"
+        "}"
+    )
+
+
+def _summarize_state_changed(payload: dict) -> str:
+    transition = f"{payload.get('previous_state')}->{payload.get('new_state')}"
+    return (
+        "{"
+        f"'monitor_id': {payload.get('monitor_id')!r}, "
+        f"'transition': {transition!r}, "
+        f"'error_message': {payload.get('error_message')!r}"
+        "}"
+    )
+
+
+def _summarize_metrics(payload: dict) -> str:
+    return f"cpu={payload.get('cpu')} ram={payload.get('ram')} disk={payload.get('disk')}"
+
+
+class _LazyEventData:
+    """Defers payload rendering until a handler actually formats the log record."""
+    __slots__ = ("summarizer", "payload")
+
+    def __init__(self, summarizer: Optional[Callable[[dict], str]], payload: dict):
+        self.summarizer = summarizer
+        self.payload = payload
+
+    def snapshot(self) -> "_LazyEventData":
+        """Copy with a shallow copy of the payload, still rendered lazily (queued logging)."""
+        payload = self.payload
+        if isinstance(payload, Mapping):
+            payload = dict(payload)
+        elif isinstance(payload, Sequence) and not isinstance(payload, str):
+            payload = list(payload)
+        return _LazyEventData(self.summarizer, payload)
+
+    def __str__(self) -> str:
+        if self.summarizer is None:
+            return str(self.payload)
+        try:
+            return self.summarizer(self.payload)
+        except Exception as e:
+            return f"<summarizer failed: {e}>"
+
+
+class _HandlerStats:
+    __slots__ = ("mode", "failures", "histogram")
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.failures = 0
+        self.histogram = LatencyHistogram()
 
 
 class GlobalEventBus:
     def __init__(self):
+        # Exact-topic subscriptions; wildcard patterns live in the trie
         self.subscribers: Dict[str, List[Callable]] = {}
+        self._pattern_trie = _TopicTrie()
+        # Concrete topic -> exact + pattern subscribers, invalidated on (un)subscribe
+        self._resolved_cache: Dict[str, List[Callable]] = {}
+        # owner (module id) -> [(kind, topic, callback)] so a module's handlers can be
+        # dropped in one go when it is disabled, unloaded or reloaded
+        self._owned: Dict[str, List[tuple]] = {}
         self.log = get_logger("Core:EventBus")
         self._active_tasks: Set[asyncio.Task] = set()
-        # Topics that should not spam INFO logs
-        self._noise_topics = ["system:metrics_update"]
+        # Topics dispatched through bounded worker pools instead of one task per emit
+        self._pools: Dict[str, _TopicWorkerPool] = {}
         # Topics with sensitive payloads (never log data)
         self._sensitive_topics = ["vault:unseal_requested", "vault:init_requested"]
+        # Per-topic event log policy: level, 1-in-N sampling and payload summarizers
+        self._event_log_levels: Dict[str, int] = {}
+        self._event_log_sample_every: Dict[str, int] = {}
+        self._event_log_counters: Dict[str, int] = {}
+        self._summarizers: Dict[str, Callable[[dict], str]] = {}
+        # Topics that should not spam INFO logs
+        self.configure_event_logging("system:metrics_update", level=logging.DEBUG)
         # Topics with very large payloads should be summarized to keep logs usable.
-        self._summarized_topics = {"monitoring:inventory_sync", "monitoring:state_changed"}
-
-    def _summarize_payload(self, topic: str, payload: dict) -> str:
-        if topic == "monitoring:inventory_sync":
-            return (
-                "{"
-                f"'owner_source': {payload.get('owner_source')!r}, "
-                f"'source_revision': {payload.get('source_revision')!r}, "
-                f"'hosts': {len(payload.get('hosts') or [])}, "
-                f"'services': {len(payload.get('services') or [])}"
-                "}"
-            )
-        if topic == "monitoring:state_changed":
-            transition = f"{payload.get('previous_state')}->{payload.get('new_state')}"
-            return (
-                "{"
-                f"'monitor_id': {payload.get('monitor_id')!r}, "
-                f"'transition': {transition!r}, "
-                f"'error_message': {payload.get('error_message')!r}"
-                "}"
+        self.register_summarizer("monitoring:inventory_sync", _summarize_inventory_sync)
+        self.register_summarizer("monitoring:state_changed", _summarize_state_changed)
+        self.register_summarizer("system:metrics_update", _summarize_metrics)
+        # Event journal: per-topic ring buffers; sticky topics replay their latest
+        # value to late subscribers (plugins activated after boot events fired)
+        self._journal: Dict[str, deque] = {}
+        self._sticky_topics: Set[str] = set()
+        self._journal_seq = 0
+        for sticky_topic in ("system:started", "vault:opened", "vault:ready_for_data",
+                             "db:connected", "iam:ready", "system:boot_complete"):
+            self.configure_journal(sticky_topic, size=10, sticky=True)
+        # Optional cross-process bridge (core.bus_bridge.BusBridge)
+        self._bridge = None
+        # Request/reply: topic -> callbacks whose return value is the reply
+        self._responders: Dict[str, List[Callable]] = {}
+        self._request_seq = 0
+        # Metrics: raw emits per topic, per-(topic, handler) latency/failures
+        self._emit_counts: Dict[str, int] = {}
+        self._handler_stats: Dict[tuple, _HandlerStats] = {}
+        self._handler_names = weakref.WeakKeyDictionary()
+        self._metrics_started = time.time()
+        # Handler execution: optional thread-pool offload for sync subscribers and
+        # slow-handler budgets (sync handlers block the loop, async ones only add latency)
+        self._offload_sync = False
+        self._offload_topics: Dict[str, bool] = {}
+        self._sync_executor: Optional[ThreadPoolExecutor] = None
+        self._sync_executor_workers = 4
+        self.slow_sync_budget = 0.05
+        self.slow_async_budget = 5.0
+        self._slow_log_throttle = 10.0
+        self._slow_last_logged: Dict[str, float] = {}
+        self.configure_event_logging("bus:slow_handler", level=logging.DEBUG)
+        # Priority lanes: exact topics and patterns -> lane (resolved per topic and cached)
+        self._priorities: Dict[str, str] = {}
+        self._priority_cache: Dict[str, str] = {}
+        self._critical_in_flight = 0
+        self._critical_idle: Optional[asyncio.Event] = None
+        self._low_lane = _LowPriorityLane(self)
+        for critical_topic in ("vault:*", "db:*", "system:maintenance_mode"):
+            self.set_priority(critical_topic, PRIORITY_CRITICAL)
+        for low_topic in ("system:metrics_update", "monitoring:**", "bus:slow_handler"):
+            self.set_priority(low_topic, PRIORITY_LOW)
+        # Topics whose bursts are collapsed into one delivery per window
+        self._coalescers: Dict[str, _TopicCoalescer] = {}
+        # Plugin toggles/reloads emit several refreshes in a row; subscribers need only one.
+        self.configure_coalescing("ui:needs_refresh", window=0.25, mode=COALESCE_DEBOUNCE,
+                                  merge=_merge_refresh_reasons, max_wait=1.0)
+        # Bursty monitoring topics: bounded queues so storms degrade predictably.
+        # Each inventory sync supersedes the previous one, so only a few are kept.
+        self.configure_pool("monitoring:inventory_sync", workers=1, maxsize=16, overflow=OVERFLOW_DROP_OLDEST)
+        self.configure_pool("monitoring:state_changed", workers=4, maxsize=2000, overflow=OVERFLOW_DROP_OLDEST)
+
+    def configure_pool(self, topic: str, workers: int = 4, maxsize: int = 1000, overflow: str = OVERFLOW_BLOCK):
+        """Dispatches `topic` through a bounded queue drained by `workers` consumer tasks.
+
+        overflow: 'block' (emit_async waits for space), 'drop_oldest' or 'drop_newest'.
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{overflow}', expected one of {OVERFLOW_POLICIES}")
+        if workers < 1 or maxsize < 1:
+            raise ValueError("workers and maxsize must be >= 1")
+
+        existing = self._pools.pop(topic, None)
+        if existing:
+            existing.stop()
+        self._pools[topic] = _TopicWorkerPool(self, topic, workers, maxsize, overflow)
+        self.log.debug(f"POOL: '{topic}' -> {workers} workers, maxsize={maxsize}, overflow={overflow}")
+
+    def configure_coalescing(self, topic: str, window: float = 0.5, mode: str = COALESCE_LATEST,
+                             merge: Callable[[dict, dict], dict] = None, max_wait: float = None):
+        """Delivers at most one merged event per `window` seconds for `topic`.
+
+        mode 'latest': the window starts at the first emit, the newest payload wins.
+        mode 'debounce': delivery happens once no emit arrived for `window` seconds,
+        but never later than `max_wait` after the first pending emit (if set).
+        merge(previous, current) -> payload replaces latest-wins when given.
+        """
+        if mode not in (COALESCE_LATEST, COALESCE_DEBOUNCE):
+            raise ValueError(f"Unknown coalescing mode '{mode}'")
+        if window <= 0:
+            raise ValueError("window must be > 0")
+
+        existing = self._coalescers.pop(topic, None)
+        if existing:
+            existing.flush()
+        self._coalescers[topic] = _TopicCoalescer(self, topic, window, mode, merge, max_wait)
+
+    def remove_coalescing(self, topic: str):
+        """Flushes anything pending and returns `topic` to immediate delivery."""
+        coalescer = self._coalescers.pop(topic, None)
+        if coalescer:
+            coalescer.flush()
+
+    def flush_coalesced(self, topic: str = None):
+        """Delivers pending coalesced events now (all topics if `topic` is None)."""
+        targets = [self._coalescers[topic]] if topic in self._coalescers else (
+            list(self._coalescers.values()) if topic is None else []
+        )
+        for coalescer in targets:
+            coalescer.flush()
+
+    def get_coalescing_stats(self) -> Dict[str, dict]:
+        return {topic: c.stats() for topic, c in self._coalescers.items()}
+
+    def configure_execution(self, offload_sync: bool = None, max_workers: int = None,
+                            slow_sync_budget: float = None, slow_async_budget: float = None):
+        """Tunes how handlers run.
+
+        offload_sync: run sync subscribers in a thread pool instead of on the event loop.
+        slow_*_budget: seconds after which a handler is reported via 'bus:slow_handler'.
+        """
+        if offload_sync is not None:
+            self._offload_sync = offload_sync
+        if max_workers is not None:
+            if max_workers < 1:
+                raise ValueError("max_workers must be >= 1")
+            self._sync_executor_workers = max_workers
+            if self._sync_executor is not None:
+                self._sync_executor.shutdown(wait=False)
+                self._sync_executor = None
+        if slow_sync_budget is not None:
+            self.slow_sync_budget = slow_sync_budget
+        if slow_async_budget is not None:
+            self.slow_async_budget = slow_async_budget
+
+    def set_sync_offload(self, topic: str, enabled: bool = True):
+        """Per-topic override of the global sync offload mode."""
+        self._offload_topics[topic] = enabled
+
+    def _should_offload(self, topic: str) -> bool:
+        return self._offload_topics.get(topic, self._offload_sync)
+
+    def _get_sync_executor(self) -> ThreadPoolExecutor:
+        if self._sync_executor is None:
+            self._sync_executor = ThreadPoolExecutor(
+                max_workers=self._sync_executor_workers, thread_name_prefix="bus-sync"
             )
-        return str(payload)
+        return self._sync_executor
+
+    def get_metrics(self) -> dict:
+        """Snapshot of emit counters, handler latency histograms and queue gauges."""
+        handlers = []
+        for (topic, handler), stats in self._handler_stats.items():
+            handlers.append({
+                "topic": topic,
+                "handler": handler,
+                "mode": stats.mode,
+                "failures": stats.failures,
+                **stats.histogram.snapshot(),
+            })
+        # Wall time per call: for async handlers this includes time spent awaiting, not only loop time
+        handlers.sort(key=lambda h: h["total_ms"], reverse=True)
+        return {
+            "since": self._metrics_started,
+            "in_flight_tasks": len(self._active_tasks),
+            "emits_total": sum(self._emit_counts.values()),
+            "topics": dict(sorted(self._emit_counts.items(), key=lambda item: item[1], reverse=True)),
+            "handlers": handlers,
+            "pools": self.get_pool_stats(),
+            "coalescing": self.get_coalescing_stats(),
+            "lanes": self.get_lane_stats(),
+            "bridge": self._bridge.stats() if self._bridge is not None else None,
+            "subscriptions": {
+                "exact": sum(len(callbacks) for callbacks in self.subscribers.values()),
+                "patterns": self._pattern_trie.size,
+                "responders": sum(len(callbacks) for callbacks in self._responders.values()),
+                "owners": {owner: len(entries) for owner, entries in self._owned.items()},
+            },
+        }
+
+    def reset_metrics(self):
+        self._emit_counts.clear()
+        self._handler_stats.clear()
+        self._metrics_started = time.time()
+
+    def set_priority(self, topic: str, lane: str):
+        """Assigns a topic or pattern to the 'critical', 'normal' or 'low' lane.
+
+        Exact topics win over patterns; among patterns the most recently set wins.
+        """
+        if lane not in PRIORITY_LANES:
+            raise ValueError(f"Unknown priority lane '{lane}', expected one of {PRIORITY_LANES}")
+        self._priorities.pop(topic, None)
+        self._priorities[topic] = lane
+        self._priority_cache.clear()
+
+    def configure_lanes(self, low_share: float = None, low_maxsize: int = None):
+        """Caps the share of loop time (0 < share <= 1) and queue size of the low-priority lane."""
+        if low_share is not None:
+            if not 0 < low_share <= 1:
+                raise ValueError("low_share must be in (0, 1]")
+            self._low_lane.share = low_share
+        if low_maxsize is not None:
+            if low_maxsize < 1:
+                raise ValueError("low_maxsize must be >= 1")
+            self._low_lane.queue = deque(self._low_lane.queue, maxlen=low_maxsize)
+
+    def get_lane_stats(self) -> dict:
+        return {
+            "critical_in_flight": self._critical_in_flight,
+            "low": self._low_lane.stats(),
+        }
+
+    def _priority_of(self, topic: str) -> str:
+        lane = self._priority_cache.get(topic)
+        if lane is None:
+            lane = self._priorities.get(topic)
+            if lane is None:
+                lane = PRIORITY_NORMAL
+                for rule in reversed(self._priorities):
+                    if is_topic_pattern(rule) and topic_matches(rule, topic):
+                        lane = self._priorities[rule]
+                        break
+            self._priority_cache[topic] = lane
+        return lane
+
+    async def _yield_to_critical(self, max_wait: float = CRITICAL_MAX_WAIT_SECONDS):
+        """Waits until no critical handler is running, but at most `max_wait` seconds."""
+        if not self._critical_in_flight:
+            return
+        if self._critical_idle is None:
+            self._critical_idle = asyncio.Event()
+        try:
+            await asyncio.wait_for(self._critical_idle.wait(), max_wait)
+        except asyncio.TimeoutError:
+            pass
+
+    def _critical_started(self):
+        self._critical_in_flight += 1
+        if self._critical_idle is not None:
+            self._critical_idle.clear()
+
+    def _critical_finished(self, _task=None):
+        self._critical_in_flight -= 1
+        if not self._critical_in_flight and self._critical_idle is not None:
+            self._critical_idle.set()
+
+    def remove_pool(self, topic: str):
+        """Returns `topic` to default one-task-per-subscriber dispatch."""
+        pool = self._pools.pop(topic, None)
+        if pool:
+            pool.stop()
+
+    def get_queue_depth(self, topic: str) -> int:
+        pool = self._pools.get(topic)
+        return pool.queue.qsize() if pool else 0
+
+    def get_pool_stats(self) -> Dict[str, dict]:
+        """Queue depth, drop and throughput counters for every pooled topic."""
+        return {topic: pool.stats() for topic, pool in self._pools.items()}
+
+    def configure_event_logging(self, topic: str, level: int = None, sample_rate: float = None):
+        """Sets the log level and/or sampling rate (0 < rate <= 1) for EVENT lines of `topic`."""
+        if level is not None:
+            self._event_log_levels[topic] = level
+        if sample_rate is not None:
+            if not 0 < sample_rate <= 1:
+                raise ValueError("sample_rate must be in (0, 1]")
+            every = max(1, round(1 / sample_rate))
+            if every == 1:
+                self._event_log_sample_every.pop(topic, None)
+            else:
+                self._event_log_sample_every[topic] = every
+
+    def register_summarizer(self, topic: str, summarizer: Callable[[dict], str], owner: str = None):
+        """Registers a payload -> str function used instead of repr() in EVENT log lines."""
+        self._summarizers[topic] = summarizer
+        if owner is not None:
+            self._owned.setdefault(owner, []).append(("summarizer", topic, summarizer))
+
+    def unregister_summarizer(self, topic: str):
+        self._summarizers.pop(topic, None)
+
+    def subscribe(self, topic: str, replay: bool = True, owner: str = None, weak: bool = False,
+                  batch: bool = False):
+        """Decorator: @bus.subscribe('topic') registers a callback.
+
+        `topic` may be a pattern such as 'monitoring:*' or 'plugin:**' ('**' only
+        as the last segment; anything else raises ValueError). If a matching sticky topic has already fired, its latest payload is
+        delivered to the new callback right away (disable with replay=False).
+        `owner` tags the subscription for unsubscribe_owner(); with weak=True the
+        bus does not keep the callback (or a bound method's instance) alive.
+        With batch=True the callback receives a tuple of payloads: the whole
+        batch of an emit_many() call, or a 1-tuple for a plain emit().
+        """
+        if is_topic_pattern(topic):
+            _check_subscription_pattern(topic)
 
-    def subscribe(self, topic: str):
-        """Decorator: @bus.subscribe('topic') registers a callback."""
         def decorator(callback):
-            if topic not in self.subscribers:
-                self.subscribers[topic] = []
-            self.subscribers[topic].append(callback)
+            registered = callback
+            # The weakref callback must remove the outermost wrapper that is actually registered
+            outermost: List[Callable] = []
+            if weak:
+                registered = _weak_handler(callback, lambda _handler: self._drop_dead(topic, outermost[0], owner))
+            if batch:
+                registered = _batch_handler(registered)
+            outermost.append(registered)
+            if is_topic_pattern(topic):
+                self._pattern_trie.add(topic, registered)
+                self._resolved_cache.clear()
+            else:
+                if topic not in self.subscribers:
+                    self.subscribers[topic] = []
+                self.subscribers[topic].append(registered)
+                self._resolved_cache.pop(topic, None)
+            if owner is not None:
+                self._owned.setdefault(owner, []).append(("subscribe", topic, registered))
             self.log.debug(f"SUBSCRIBE: Registered for: {topic} ({callback.__name__})")
+            if replay and self._sticky_topics:
+                self._replay_sticky(topic, registered)
             return callback
         return decorator
 
-    def emit(self, topic: str, payload: dict = None):
-        """Dispatches an event to all subscribers, tracking async tasks."""
+    def unsubscribe(self, topic: str, callback: Callable) -> bool:
+        """Removes one subscription of `callback` (or its weak wrapper) from `topic`."""
+        if is_topic_pattern(topic):
+            registered = self._find_registered(self._pattern_callbacks(topic), callback)
+            removed = registered is not None and self._pattern_trie.remove(topic, registered)
+            if removed:
+                self._resolved_cache.clear()
+        else:
+            callbacks = self.subscribers.get(topic, [])
+            registered = self._find_registered(callbacks, callback)
+            removed = registered is not None
+            if removed:
+                callbacks.remove(registered)
+                if not callbacks:
+                    del self.subscribers[topic]
+                self._resolved_cache.pop(topic, None)
+        if removed:
+            self._forget_owned("subscribe", topic, registered)
+            self.log.debug(f"UNSUBSCRIBE: Removed from: {topic} ({callback.__name__})")
+        return removed
+
+    def unsubscribe_owner(self, owner: str) -> int:
+        """Drops every subscription, responder and summarizer registered for `owner`.
+
+        Returns the number of registrations removed.
+        """
+        entries = self._owned.pop(owner, [])
+        for kind, topic, callback in entries:
+            if kind == "subscribe":
+                if is_topic_pattern(topic):
+                    self._pattern_trie.remove(topic, callback)
+                else:
+                    callbacks = self.subscribers.get(topic)
+                    if callbacks and callback in callbacks:
+                        callbacks.remove(callback)
+                        if not callbacks:
+                            del self.subscribers[topic]
+            elif kind == "respond":
+                responders = self._responders.get(topic)
+                if responders and callback in responders:
+                    responders.remove(callback)
+                    if not responders:
+                        del self._responders[topic]
+            elif kind == "summarizer" and self._summarizers.get(topic) is callback:
+                del self._summarizers[topic]
+        if entries:
+            self._resolved_cache.clear()
+            self.log.info(f"UNSUBSCRIBE: Released {len(entries)} bus registration(s) of '{owner}'")
+        return len(entries)
+
+    def _pattern_callbacks(self, pattern: str) -> List[Callable]:
+        node = self._pattern_trie.root
+        for segment in pattern.split(TOPIC_SEPARATOR):
+            if segment == WILDCARD_REST:
+                return node.rest_callbacks
+            node = node.children.get(segment)
+            if node is None:
+                return []
+        return node.callbacks
+
+    @staticmethod
+    def _find_registered(callbacks: List[Callable], callback: Callable) -> Optional[Callable]:
+        for registered in callbacks:
+            if _same_callback(registered, callback):
+                return registered
+        return None
+
+    def _forget_owned(self, kind: str, topic: str, callback: Callable):
+        for owner, entries in list(self._owned.items()):
+            for entry in entries:
+                if entry[0] == kind and entry[1] == topic and entry[2] is callback:
+                    entries.remove(entry)
+                    if not entries:
+                        del self._owned[owner]
+                    return
+
+    def _drop_dead(self, topic: str, handler: Callable, owner: Optional[str]):
+        """Weakref callback: the target of a weak subscription was garbage collected."""
+        if is_topic_pattern(topic):
+            removed = self._pattern_trie.remove(topic, handler)
+        else:
+            callbacks = self.subscribers.get(topic)
+            removed = bool(callbacks) and handler in callbacks
+            if removed:
+                callbacks.remove(handler)
+                if not callbacks:
+                    del self.subscribers[topic]
+        if removed:
+            self._resolved_cache.clear()
+            if owner is not None:
+                self._forget_owned("subscribe", topic, handler)
+
+    # --- EVENT JOURNAL ---
+
+    def configure_journal(self, topic: str, size: int = 50, sticky: bool = False):
+        """Keeps the last `size` events of `topic`; sticky topics replay their latest value on subscribe."""
+        if size < 1:
+            raise ValueError("size must be >= 1")
+        existing = self._journal.get(topic)
+        self._journal[topic] = deque(existing or (), maxlen=size)
+        if sticky:
+            self._sticky_topics.add(topic)
+        else:
+            self._sticky_topics.discard(topic)
+
+    def clear_sticky(self, topic: str):
+        """Forgets the journal of `topic`, e.g. when the state it announced no longer holds."""
+        journal = self._journal.get(topic)
+        if journal is not None:
+            journal.clear()
+
+    def get_journal(self, topic: str, since_seq: int = 0) -> List[dict]:
+        """Journaled events of `topic` with a sequence number greater than `since_seq`."""
+        return [
+            {"seq": seq, "ts": ts, "payload": payload}
+            for seq, ts, payload in self._journal.get(topic, ())
+            if seq > since_seq
+        ]
+
+    def last_value(self, topic: str) -> Optional[dict]:
+        journal = self._journal.get(topic)
+        return journal[-1][2] if journal else None
+
+    def _record(self, topic: str, payload: dict):
+        journal = self._journal.get(topic)
+        if journal is not None and topic not in self._sensitive_topics:
+            self._journal_seq += 1
+            journal.append((self._journal_seq, time.time(), payload))
+
+    def _replay_sticky(self, topic: str, callback: Callable):
+        if is_topic_pattern(topic):
+            targets = [t for t in self._sticky_topics if topic_matches(topic, t)]
+        else:
+            targets = [topic] if topic in self._sticky_topics else []
+
+        for target in targets:
+            journal = self._journal.get(target)
+            if not journal:
+                continue
+            payload = journal[-1][2]
+            self.log.debug(f"REPLAY: Delivering sticky '{target}' to late subscriber {callback.__name__}")
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            if loop is not None:
+                # Deferred so the subscriber's own setup finishes before its handler runs
+                loop.call_soon(self._dispatch_one, target, callback, payload)
+            elif not inspect.iscoroutinefunction(callback):
+                self._dispatch_one(target, callback, payload)
+
+    def respond(self, topic: str, owner: str = None):
+        """Decorator: @bus.respond('topic') answers bus.request() calls with its return value."""
+        def decorator(callback):
+            self._responders.setdefault(topic, []).append(callback)
+            if owner is not None:
+                self._owned.setdefault(owner, []).append(("respond", topic, callback))
+            self.log.debug(f"RESPOND: Registered responder for: {topic} ({callback.__name__})")
+            return callback
+        return decorator
+
+    def remove_responder(self, topic: str, callback: Callable) -> bool:
+        responders = self._responders.get(topic)
+        if not responders or callback not in responders:
+            return False
+        responders.remove(callback)
+        if not responders:
+            del self._responders[topic]
+        self._forget_owned("respond", topic, callback)
+        return True
+
+    def has_responder(self, topic: str) -> bool:
+        return bool(self._responders.get(topic))
+
+    async def request(self, topic: str, payload: dict = None, timeout: float = 5.0):
+        """Sends a request and returns the first successful reply.
+
+        Raises NoResponderError if nobody responds to `topic`, BusRequestTimeout if no
+        reply arrives within `timeout` seconds, or the responder's exception if every
+        responder failed. Outstanding responders are cancelled once a reply is chosen.
+        """
+        tasks = self._start_request(topic, payload)
+        pending = set(tasks)
+        last_error: Optional[BaseException] = None
+        deadline = asyncio.get_running_loop().time() + timeout
+        try:
+            while pending:
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.cancelled():
+                        continue
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if last_error is not None and not pending:
+            raise last_error
+        raise BusRequestTimeout(f"No reply for '{topic}' within {timeout:.1f}s")
+
+    async def request_all(self, topic: str, payload: dict = None, timeout: float = 5.0,
+                          return_exceptions: bool = False) -> list:
+        """Fans a request out to every responder and gathers the replies.
+
+        Replies arriving after `timeout` are dropped (those responders are cancelled).
+        Failed responders are logged and omitted unless `return_exceptions` is True.
+        Raises BusRequestTimeout only if nothing at all arrived in time.
+        """
+        tasks = self._start_request(topic, payload)
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+
+        replies = []
+        for task in tasks:
+            if task not in done or task.cancelled():
+                continue
+            exc = task.exception()
+            if exc is None:
+                replies.append(task.result())
+            elif return_exceptions:
+                replies.append(exc)
+        if not done:
+            raise BusRequestTimeout(f"No reply for '{topic}' within {timeout:.1f}s")
+        if pending:
+            self.log.warning(f"REQUEST: {len(pending)}/{len(tasks)} responder(s) for '{topic}' timed out")
+        return replies
+
+    def _start_request(self, topic: str, payload: Optional[dict]) -> List[asyncio.Task]:
+        responders = list(self._responders.get(topic, ()))
+        if not responders:
+            raise NoResponderError(f"No responder registered for '{topic}'")
+        if payload is None:
+            payload = {}
+
+        self._request_seq += 1
+        request_id = self._request_seq
+        self._emit_counts[topic] = self._emit_counts.get(topic, 0) + 1
+        self.log.debug(f"REQUEST: #{request_id} {topic} -> {len(responders)} responder(s)")
+        return [
+            asyncio.create_task(
+                self._call_responder(topic, callback, payload),
+                name=f"bus:request:{topic}:{request_id}:{callback.__name__}"
+            )
+            for callback in responders
+        ]
+
+    async def _call_responder(self, topic: str, callback: Callable, payload: dict):
+        mode = "async" if inspect.iscoroutinefunction(callback) else "sync"
+        start = time.perf_counter()
+        failed = False
+        try:
+            result = callback(payload)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+        except Exception as e:
+            failed = True
+            self.log.error(f"REQUEST_FAILED: Responder '{callback.__name__}' for '{topic}' raised: {e}", exc_info=True)
+            raise
+        finally:
+            self._observe_handler(topic, callback, time.perf_counter() - start, mode, failed)
+
+    def _resolve(self, topic: str) -> List[Callable]:
+        """Returns all callbacks for a concrete topic (cached until subscriptions change)."""
+        resolved = self._resolved_cache.get(topic)
+        if resolved is None:
+            resolved = list(self.subscribers.get(topic, ()))
+            if self._pattern_trie.size:
+                resolved.extend(self._pattern_trie.match(topic))
+            self._resolved_cache[topic] = resolved
+        return resolved
+
+    def emit(self, topic: str, payload: dict = None, readonly: bool = False):
+        """Dispatches an event to all subscribers, tracking async tasks.
+
+        With readonly=True subscribers receive a ReadOnlyMapping view instead of the dict.
+        """
+        if payload is None:
+            payload = {}
+
+        if self._bridge is not None:
+            self._bridge.forward(topic, payload)
+
+        self._emit_local(topic, readonly_view(payload) if readonly else payload)
+
+    def emit_many(self, topic: str, payloads: Iterable[dict], readonly: bool = False):
+        """Emits a batch of events with one log line and one dispatch per subscriber.
+
+        Batch subscribers (subscribe(batch=True)) get the whole tuple in one call;
+        other async subscribers get one task that walks the batch in order, and
+        sync subscribers are called for each payload in turn. Pooled, coalesced and
+        low-priority topics queue the payloads individually as usual.
+        """
+        batch: Tuple = tuple({} if payload is None else payload for payload in payloads)
+        if not batch:
+            return
+
+        if self._bridge is not None:
+            for payload in batch:
+                self._bridge.forward(topic, payload)
+        if readonly:
+            batch = tuple(readonly_view(payload) for payload in batch)
+
+        self._emit_counts[topic] = self._emit_counts.get(topic, 0) + len(batch)
+        if topic in self._journal:
+            for payload in batch:
+                self._record(topic, payload)
+
+        coalescer = self._coalescers.get(topic)
+        if coalescer is not None:
+            for payload in batch:
+                coalescer.push(payload)
+            return
+
+        pool = self._pools.get(topic)
+        low_lane = pool is None and self._priority_of(topic) == PRIORITY_LOW
+        if pool is not None or low_lane:
+            self._log_event(topic, batch[-1], batch_size=len(batch))
+            if not self._resolve(topic):
+                return
+            if not _loop_running():
+                # No loop (e.g. emitted from a thread): the default dispatcher logs async failures
+                pool = None
+                low_lane = False
+            for payload in batch:
+                if pool is not None:
+                    pool.submit_nowait(payload)
+                elif low_lane:
+                    self._low_lane.submit(topic, payload)
+                else:
+                    self._dispatch(topic, payload)
+            return
+
+        self._log_event(topic, batch[-1], batch_size=len(batch))
+        self._dispatch_batch(topic, batch)
+
+    def receive_remote(self, topic: str, payload: dict):
+        """Entry point for events arriving from another worker process (never re-forwarded)."""
+        self._emit_local(topic, payload)
+
+    def attach_bridge(self, bridge):
+        """Forwards local emits to other processes through `bridge` (see core.bus_bridge)."""
+        self._bridge = bridge
+
+    def detach_bridge(self):
+        self._bridge = None
+
+    def _emit_local(self, topic: str, payload: dict):
+        self._emit_counts[topic] = self._emit_counts.get(topic, 0) + 1
+        if topic in self._journal:
+            self._record(topic, payload)
+
+        coalescer = self._coalescers.get(topic)
+        if coalescer is not None:
+            coalescer.push(payload)
+            return
+
+        self._deliver(topic, payload)
+
+    def _deliver(self, topic: str, payload: dict):
+        """Logs and hands an event to its pool or the default dispatcher."""
+        self._log_event(topic, payload)
+
+        pool = self._pools.get(topic)
+        if pool is not None or self._priority_of(topic) == PRIORITY_LOW:
+            if not self._resolve(topic):
+                return
+            if _loop_running():
+                if pool is not None:
+                    pool.submit_nowait(payload)
+                else:
+                    self._low_lane.submit(topic, payload)
+                return
+            # No loop (e.g. emitted from a thread): the default dispatcher logs async failures
+
+        self._dispatch(topic, payload)
+
+    async def emit_async(self, topic: str, payload: dict = None):
+        """Like emit(), but waits for queue space on pooled topics with the 'block' policy."""
         if payload is None:
             payload = {}
 
-        if topic == "system:metrics_update":
-            self.log.debug(f"METRICS: {topic}")
-        elif topic in self._sensitive_topics:
-            self.log.info(f"EVENT: {topic} | Data: [REDACTED]")
-        elif topic in self._summarized_topics:
-            self.log.info(f"EVENT: {topic} | Data: {self._summarize_payload(topic, payload)}")
+        pool = self._pools.get(topic)
+        if pool is None or pool.overflow != OVERFLOW_BLOCK or topic in self._coalescers:
+            self.emit(topic, payload)
+            return
+
+        # Same bookkeeping as emit() -> _emit_local(); only the enqueue differs
+        if self._bridge is not None:
+            self._bridge.forward(topic, payload)
+        self._emit_counts[topic] = self._emit_counts.get(topic, 0) + 1
+        if topic in self._journal:
+            self._record(topic, payload)
+
+        self._log_event(topic, payload)
+        if self._resolve(topic):
+            await pool.put(payload)
+
+    def _log_event(self, topic: str, payload: dict, batch_size: int = 0):
+        """Logs an emit without rendering the payload unless a handler will output it.
+
+        Sampled-out emits and levels no handler accepts return before anything is
+        built. For emit_many() one line is written per batch, showing the last payload.
+        """
+        if topic in self._sensitive_topics:
+            self.log.info("EVENT: %s | Data: [REDACTED]", self._event_label(topic, batch_size))
+            return
+
+        every = self._event_log_sample_every.get(topic)
+        if every:
+            count = self._event_log_counters.get(topic, 0)
+            self._event_log_counters[topic] = count + 1
+            if count % every:
+                return
+
+        level = self._event_log_levels.get(topic, logging.INFO)
+        if not self._event_log_wanted(level):
+            return
+
+        data = _LazyEventData(self._summarizers.get(topic), payload)
+        if every:
+            self.log.log(level, "EVENT: %s (1/%d sampled) | Data: %s",
+                         self._event_label(topic, batch_size), every, data)
         else:
-            self.log.info(f"EVENT: {topic} | Data: {payload}")
+            self.log.log(level, "EVENT: %s | Data: %s", self._event_label(topic, batch_size), data)
+
+    @staticmethod
+    def _event_label(topic: str, batch_size: int) -> str:
+        return f"{topic} (batch of {batch_size}, last shown)" if batch_size else topic
 
-        if topic in self.subscribers:
-            for callback in self.subscribers[topic]:
+    def _event_log_wanted(self, level: int) -> bool:
+        """True if some handler the bus logger propagates to would output `level`.
+
+        Logger.isEnabledFor() alone is not enough: the root logger stays at DEBUG
+        and the handlers decide what is written.
+        """
+        if not self.log.isEnabledFor(level):
+            return False
+        logger, found = self.log, False
+        while logger is not None:
+            for handler in logger.handlers:
+                found = True
+                if level >= handler.level:
+                    return True
+            if not logger.propagate:
+                break
+            logger = logger.parent
+        return not found and logging.lastResort is not None and level >= logging.lastResort.level
+
+    def _dispatch(self, topic: str, payload: dict):
+        """Default dispatch: sync callbacks inline (or offloaded), one tracked task per async callback."""
+        for callback in self._resolve(topic):
+            self._dispatch_one(topic, callback, payload)
+
+    def _dispatch_one(self, topic: str, callback: Callable, payload: dict):
+        try:
+            if inspect.iscoroutinefunction(callback) or self._should_offload(topic):
+                if inspect.iscoroutinefunction(callback):
+                    coro = self._run_async(topic, callback, payload)
+                else:
+                    coro = self._run_offloaded(topic, callback, payload)
                 try:
-                    if inspect.iscoroutinefunction(callback):
-                        task = asyncio.create_task(
-                            callback(payload),
-                            name=f"bus:{topic}:{callback.__name__}"
-                        )
-                        self._track_task(task, topic, callback.__name__)
-                    else:
-                        callback(payload)
-                except Exception as e:
-                    self.log.error(f"ERROR: Callback '{callback.__name__}' for '{topic}' raised: {e}", exc_info=True)
+                    task = asyncio.create_task(coro, name=f"bus:{topic}:{callback.__name__}")
+                except RuntimeError:
+                    # No running loop: don't leave the coroutine un-awaited; logged below
+                    coro.close()
+                    raise
+                self._track_task(task, topic, callback.__name__)
+            else:
+                task = None
+                self._run_sync(topic, callback, payload)
+            if task is not None and self._priority_of(topic) == PRIORITY_CRITICAL:
+                # Low-priority lanes hold back (briefly) while this handler is in flight
+                self._critical_started()
+                task.add_done_callback(self._critical_finished)
+        except Exception as e:
+            self.log.error(f"ERROR: Callback '{callback.__name__}' for '{topic}' raised: {e}", exc_info=True)
+
+    def _dispatch_batch(self, topic: str, batch: Tuple):
+        """emit_many() dispatch: one call, task or inline loop per subscriber."""
+        for callback in self._resolve(topic):
+            batch_target = getattr(callback, "__bus_batch__", None)
+            if batch_target is not None:
+                self._dispatch_one(topic, batch_target, batch)
+                continue
+            if not inspect.iscoroutinefunction(callback) and not self._should_offload(topic):
+                for payload in batch:
+                    try:
+                        self._run_sync(topic, callback, payload)
+                    except Exception as e:
+                        self.log.error(f"ERROR: Callback '{callback.__name__}' for '{topic}' raised: {e}", exc_info=True)
+                continue
+            try:
+                task = asyncio.create_task(
+                    self._run_many(topic, callback, batch),
+                    name=f"bus:{topic}:{callback.__name__}:batch"
+                )
+            except RuntimeError as e:
+                self.log.error(f"ERROR: Callback '{callback.__name__}' for '{topic}' needs a running loop: {e}")
+                continue
+            self._track_task(task, topic, callback.__name__)
+            if self._priority_of(topic) == PRIORITY_CRITICAL:
+                self._critical_started()
+                task.add_done_callback(self._critical_finished)
+
+    async def _run_many(self, topic: str, callback: Callable, batch: Tuple):
+        """Runs one subscriber over a batch; a failing payload does not stop the rest."""
+        is_async = inspect.iscoroutinefunction(callback)
+        for payload in batch:
+            try:
+                if is_async:
+                    await self._run_async(topic, callback, payload)
+                else:
+                    await self._run_offloaded(topic, callback, payload)
+            except Exception as e:
+                self.log.error(f"ERROR: Callback '{callback.__name__}' for '{topic}' raised: {e}", exc_info=True)
+
+    async def _dispatch_inline(self, topic: str, payload: dict):
+        """Pool worker dispatch: awaits each callback in turn instead of spawning tasks."""
+        for callback in self._resolve(topic):
+            try:
+                if inspect.iscoroutinefunction(callback):
+                    await self._run_async(topic, callback, payload)
+                elif self._should_offload(topic):
+                    await self._run_offloaded(topic, callback, payload)
+                else:
+                    self._run_sync(topic, callback, payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.log.error(f"ERROR: Callback '{callback.__name__}' for '{topic}' raised: {e}", exc_info=True)
+
+    def _run_sync(self, topic: str, callback: Callable, payload: dict):
+        start = time.perf_counter()
+        failed = False
+        try:
+            callback(payload)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._observe_handler(topic, callback, time.perf_counter() - start, "sync", failed)
+
+    async def _run_async(self, topic: str, callback: Callable, payload: dict):
+        start = time.perf_counter()
+        failed = False
+        try:
+            await callback(payload)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._observe_handler(topic, callback, time.perf_counter() - start, "async", failed)
+
+    async def _run_offloaded(self, topic: str, callback: Callable, payload: dict):
+        def _timed_call():
+            start = time.perf_counter()
+            try:
+                callback(payload)
+            finally:
+                # Measured inside the worker thread: queueing time is not the handler's fault
+                duration[0] = time.perf_counter() - start
+
+        duration = [0.0]
+        failed = False
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._get_sync_executor(), _timed_call)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._observe_handler(topic, callback, duration[0], "thread", failed)
+
+    def _handler_name(self, callback: Callable) -> str:
+        try:
+            return self._handler_names[callback]
+        except (KeyError, TypeError):
+            pass
+        name = f"{getattr(callback, '__module__', '?')}.{getattr(callback, '__qualname__', callback.__name__)}"
+        try:
+            self._handler_names[callback] = name
+        except TypeError:
+            pass
+        return name
+
+    def _observe_handler(self, topic: str, callback: Callable, duration: float, mode: str, failed: bool = False):
+        """Records handler metrics and reports handlers that exceed their budget."""
+        handler = self._handler_name(callback)
+        stats = self._handler_stats.get((topic, handler))
+        if stats is None:
+            stats = self._handler_stats[(topic, handler)] = _HandlerStats(mode)
+        stats.histogram.observe(duration)
+        if failed:
+            stats.failures += 1
+
+        budget = self.slow_async_budget if mode == "async" else self.slow_sync_budget
+        if duration <= budget or topic == "bus:slow_handler":
+            return
+
+        key = f"{topic}|{handler}"
+        now = time.monotonic()
+        if now - self._slow_last_logged.get(key, 0.0) >= self._slow_log_throttle:
+            self._slow_last_logged[key] = now
+            self.log.warning(
+                f"SLOW_HANDLER: '{handler}' for '{topic}' took {duration * 1000:.1f} ms "
+                f"({mode}, budget {budget * 1000:.0f} ms)"
+            )
+        self.emit("bus:slow_handler", {
+            "topic": topic,
+            "handler": handler,
+            "mode": mode,
+            "duration_ms": round(duration * 1000, 3),
+            "budget_ms": round(budget * 1000, 3),
+        })
 
     def _track_task(self, task: asyncio.Task, topic: str, callback_name: str):
         """Tracks an async task and logs failures via done callback."""
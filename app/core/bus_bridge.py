@@ -0,0 +1,296 @@
+"""
+Cross-process event bus bridge.
+
+Each worker process runs a BusBridge. Exactly one of them (whoever holds the
+lock file) also hosts the BusBroker, a Unix-domain-socket server that relays
+frames between all connected workers. If the broker's process dies, the lock
+is released and another worker takes over on its next reconnect attempt.
+
+Frame layout (network byte order):
+
+    uint32  body length
+    uint16  topic length
+    16s     origin node id
+    bytes   topic (utf-8)
+    bytes   payload (compact JSON, utf-8; orjson when installed)
+
+The broker relays frames verbatim, so only the sending and receiving workers
+pay for (de)serialization. Payloads must be JSON-serializable: anything else
+(including datetimes and dataclasses) is rejected and not forwarded, instead of
+arriving on other workers as a string.
+"""
+import asyncio
+import fcntl
+import json
+import os
+import struct
+import uuid
+from collections import deque
+from typing import Dict, List, Optional, Set
+
+from core.bus import GlobalEventBus, topic_matches
+from core.logger import get_logger
+
+# Optional fast serializer for frame payloads (falls back to json)
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+    # Reject datetimes and dataclasses like json does; int keys become strings like with json
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
+log = get_logger("Core:BusBridge")
+
+_LENGTH = struct.Struct("!I")
+_HEADER = struct.Struct("!H16s")
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+# Per-connection write buffer above which frames are dropped instead of queued
+MAX_BUFFERED_BYTES = 8 * 1024 * 1024
+
+
+def _dumps(payload) -> bytes:
+    """Compact JSON bytes; raises TypeError for values JSON cannot represent."""
+    if _ORJSON_AVAILABLE:
+        return orjson.dumps(payload, option=_ORJSON_OPTIONS)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(body: bytes):
+    return orjson.loads(body) if _ORJSON_AVAILABLE else json.loads(body)
+
+
+def encode_frame(origin: bytes, topic: str, payload: dict) -> bytes:
+    topic_bytes = topic.encode("utf-8")
+    body = _dumps(payload)
+    size = _HEADER.size + len(topic_bytes) + len(body)
+    return b"".join((_LENGTH.pack(size), _HEADER.pack(len(topic_bytes), origin), topic_bytes, body))
+
+
+def decode_body(body: bytes):
+    """Returns (origin, topic, payload) for a frame body without its length prefix."""
+    topic_length, origin = _HEADER.unpack_from(body)
+    start = _HEADER.size
+    topic = body[start:start + topic_length].decode("utf-8")
+    payload = _loads(body[start + topic_length:]) if len(body) > start + topic_length else {}
+    return origin, topic, payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> bytes:
+    """Reads one frame body; raises IncompleteReadError on EOF."""
+    (size,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+    if size > MAX_FRAME_BYTES:
+        raise ValueError(f"Frame of {size} bytes exceeds limit")
+    return await reader.readexactly(size)
+
+
+class BusBroker:
+    """Relays frames from each connected worker to every other worker."""
+
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._clients: Set[asyncio.StreamWriter] = set()
+        self._handlers: Set[asyncio.Task] = set()
+        self.relayed = 0
+        self.dropped = 0
+
+    async def start(self):
+        if os.path.exists(self.socket_path):
+            # We hold the lock, so any existing socket file is stale
+            os.unlink(self.socket_path)
+        self._server = await asyncio.start_unix_server(self._handle_client, path=self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        log.info(f"BROKER: Listening on {self.socket_path}")
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+        for writer in list(self._clients):
+            writer.close()
+        if self._handlers:
+            # Let connection handlers observe EOF and finish instead of being cancelled
+            await asyncio.wait(list(self._handlers), timeout=1.0)
+        if self._server:
+            await self._server.wait_closed()
+            self._server = None
+        self._clients.clear()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._clients.add(writer)
+        handler_task = asyncio.current_task()
+        self._handlers.add(handler_task)
+        log.debug(f"BROKER: Worker connected ({len(self._clients)} total)")
+        try:
+            while True:
+                body = await read_frame(reader)
+                frame = _LENGTH.pack(len(body)) + body
+                for client in self._clients:
+                    if client is writer or client.is_closing():
+                        continue
+                    if client.transport.get_write_buffer_size() > MAX_BUFFERED_BYTES:
+                        self.dropped += 1
+                        continue
+                    client.write(frame)
+                self.relayed += 1
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception as e:
+            log.warning(f"BROKER: Dropping worker connection after bad frame: {e}")
+        finally:
+            self._clients.discard(writer)
+            self._handlers.discard(handler_task)
+            writer.close()
+            log.debug(f"BROKER: Worker disconnected ({len(self._clients)} remaining)")
+
+
+class BusBridge:
+    """Forwards selected topics between this process's bus and other workers."""
+
+    def __init__(self, bus: GlobalEventBus, socket_path: str, topics: List[str], reconnect_delay: float = 1.0):
+        self.bus = bus
+        self.socket_path = socket_path
+        self.lock_path = f"{socket_path}.lock"
+        self.topics = topics
+        self.reconnect_delay = reconnect_delay
+        self.node_id = uuid.uuid4().bytes
+        self.broker: Optional[BusBroker] = None
+        self._lock_fd: Optional[int] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+        # Frames emitted while disconnected, flushed on (re)connect
+        self._backlog: deque = deque(maxlen=1000)
+        self._forward_cache: Dict[str, bool] = {}
+        self.sent = 0
+        self.received = 0
+        self.dropped = 0
+
+    def should_forward(self, topic: str) -> bool:
+        cached = self._forward_cache.get(topic)
+        if cached is None:
+            cached = topic not in self.bus._sensitive_topics and any(
+                topic_matches(pattern, topic) for pattern in self.topics
+            )
+            self._forward_cache[topic] = cached
+        return cached
+
+    def forward(self, topic: str, payload: dict):
+        """Called by the bus for every local emit."""
+        if not self._running or not self.should_forward(topic):
+            return
+        try:
+            frame = encode_frame(self.node_id, topic, payload)
+        except (TypeError, ValueError) as e:
+            self.dropped += 1
+            log.warning(f"BRIDGE: Payload of '{topic}' is not serializable, not forwarded: {e}")
+            return
+
+        writer = self._writer
+        if writer is None or writer.is_closing():
+            if len(self._backlog) == self._backlog.maxlen:
+                self.dropped += 1
+            self._backlog.append(frame)
+            return
+        if writer.transport.get_write_buffer_size() > MAX_BUFFERED_BYTES:
+            self.dropped += 1
+            return
+        writer.write(frame)
+        self.sent += 1
+
+    async def start(self):
+        if self._running:
+            return
+        self._running = True
+        self.bus.attach_bridge(self)
+        self._task = self.bus.create_tracked_task(self._run(), name="bus_bridge:connection")
+        log.info(f"BRIDGE: Started (node {self.node_id.hex()[:8]}) forwarding {', '.join(self.topics)}")
+
+    async def stop(self):
+        self._running = False
+        self.bus.detach_bridge()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+        if self.broker:
+            await self.broker.stop()
+            self.broker = None
+        self._release_lock()
+
+    def _try_acquire_lock(self) -> bool:
+        if self._lock_fd is not None:
+            return True
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        return True
+
+    def _release_lock(self):
+        if self._lock_fd is not None:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    async def _run(self):
+        while self._running:
+            try:
+                if self.broker is None and self._try_acquire_lock():
+                    self.broker = BusBroker(self.socket_path)
+                    await self.broker.start()
+
+                reader, writer = await asyncio.open_unix_connection(self.socket_path)
+                self._writer = writer
+                log.info(f"BRIDGE: Connected to broker{' (hosted here)' if self.broker else ''}")
+                while self._backlog:
+                    writer.write(self._backlog.popleft())
+                    self.sent += 1
+                await self._read_loop(reader)
+            except asyncio.CancelledError:
+                raise
+            except (FileNotFoundError, ConnectionError, asyncio.IncompleteReadError) as e:
+                log.debug(f"BRIDGE: Broker unavailable ({type(e).__name__}), retrying...")
+            except Exception as e:
+                log.error(f"BRIDGE: Connection error: {e}", exc_info=True)
+            finally:
+                if self._writer is not None:
+                    self._writer.close()
+                    self._writer = None
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def _read_loop(self, reader: asyncio.StreamReader):
+        while True:
+            body = await read_frame(reader)
+            try:
+                origin, topic, payload = decode_body(body)
+            except (ValueError, UnicodeDecodeError) as e:
+                log.warning(f"BRIDGE: Discarding undecodable frame: {e}")
+                continue
+            if origin == self.node_id:
+                continue
+            self.received += 1
+            self.bus.receive_remote(topic, payload)
+
+    def stats(self) -> dict:
+        return {
+            "node_id": self.node_id.hex(),
+            "connected": self._writer is not None and not self._writer.is_closing(),
+            "is_broker": self.broker is not None,
+            "sent": self.sent,
+            "received": self.received,
+            "dropped": self.dropped,
+            "backlog": len(self._backlog),
+        }
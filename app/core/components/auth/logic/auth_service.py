@@ -1,8 +1,11 @@
+import asyncio
 import os
 import logging
+from sqlalchemy import select
 from core.bus import bus
 from core.logger import get_logger
-from core.components.database.logic.db_service import Base, db_instance
+from core.components.database.logic.db_service import db_instance
+from core.components.database.logic.migrations import Migration, schema_migrations
 from .hashing import hash_password, verify_password
 from .models import User
 
@@ -21,13 +24,16 @@ _warn_logger = logging.getLogger("Core:AuthService")
 
 class AuthService:
     def __init__(self):
+        schema_migrations.register("core.iam", [
+            Migration(1, "create users table", lambda connection: User.__table__.create(bind=connection, checkfirst=True)),
+        ], tables=[User.__table__])
         bus.subscribe("db:connected")(self.initialize_iam)
 
     async def initialize_iam(self, payload):
         log.info("IAM: Starting initialization...")
         try:
-            Base.metadata.create_all(bind=db_instance.engine)
-            log.debug("DB: IAM tables checked/created.")
+            await schema_migrations.upgrade()
+            log.debug("DB: Schema migrations checked.")
             self._seed_users()
             log.info("SUCCESS: IAM Service ready.")
             bus.emit("iam:ready")
@@ -76,22 +82,24 @@ class AuthService:
                 session.commit()
                 log.info(f"UPDATE: Password for '{username}' updated from environment.")
 
-    def authenticate_user(self, username: str, password: str):
+    async def authenticate_user(self, username: str, password: str):
         """Verifies credentials and returns the User object or None."""
         log.info(f"AUTH: Login attempt for user: {username}")
 
-        if not db_instance.SessionLocal:
+        if not db_instance.AsyncSessionLocal:
             log.error("AUTH: Login impossible: Database session unavailable.")
             return None
 
-        with db_instance.SessionLocal() as session:
-            user = session.query(User).filter(User.username == username).first()
+        async with db_instance.AsyncSessionLocal() as session:
+            result = await session.execute(select(User).where(User.username == username))
+            user = result.scalars().first()
 
             if not user:
                 log.warning(f"AUTH: Login failed: User '{username}' does not exist.")
                 return None
 
-            if verify_password(str(user.hashed_password), password):
+            # argon2 is CPU-heavy by design: keep it off the event loop
+            if await asyncio.to_thread(verify_password, str(user.hashed_password), password):
                 log.info(f"SUCCESS: Login successful: {username} ({user.full_name})")
                 return user
 
@@ -2,9 +2,7 @@ from nicegui import ui, app
 from core.logger import get_logger
 # FIX 1: 'app.' Präfixe entfernt
 from core.components.database.logic.db_service import db_instance
-from core.components.auth.logic.auth_service import User
-# FIX 2: Von bootstrap auf unsere neue hashing.py umgestellt
-from core.components.auth.logic.hashing import verify_password
+from core.components.auth.logic.auth_service import auth_service
 
 log = get_logger("UI:Login")
 
@@ -21,27 +19,24 @@ def render_login_page():
             pass_input = ui.input('Passwort').props('dark outlined password').classes('w-full')
 
             async def try_login():
-                if not db_instance.SessionLocal:
+                if not db_instance.AsyncSessionLocal:
                     ui.notify('Datenbank nicht bereit!', type='negative')
                     return
 
-                with db_instance.SessionLocal() as session:
-                    user = session.query(User).filter(User.username == user_input.value).first()
-                    
-                    # FIX 3: Nutzt jetzt die neue verify_password Funktion
-                    # WICHTIG: Erst der Hash aus der DB, dann das User-Passwort
-                    if user and verify_password(user.hashed_password, pass_input.value):
-                        app.storage.user.update({
-                            'authenticated': True,
-                            'username': user.username,
-                            'full_name': user.full_name,
-                            'roles': user.roles,
-                            'email': user.email
-                        })
-                        ui.notify(f'Willkommen zurück, {user.full_name}!', type='positive')
-                        ui.navigate.to('/dashboard')
-                    else:
-                        ui.notify('Anmeldung fehlgeschlagen: Falscher User oder Passwort', type='negative')
+                # Password check runs in a worker thread (argon2 would block the event loop)
+                user = await auth_service.authenticate_user(user_input.value, pass_input.value)
+                if user:
+                    app.storage.user.update({
+                        'authenticated': True,
+                        'username': user.username,
+                        'full_name': user.full_name,
+                        'roles': user.roles,
+                        'email': user.email
+                    })
+                    ui.notify(f'Willkommen zurück, {user.full_name}!', type='positive')
+                    ui.navigate.to('/dashboard')
+                else:
+                    ui.notify('Anmeldung fehlgeschlagen: Falscher User oder Passwort', type='negative')
 
             ui.button('Einloggen', on_click=try_login).classes('w-full py-4 bg-indigo-600 rounded-xl font-bold')
             
@@ -1,6 +1,7 @@
 import asyncio
 from nicegui import ui
 from ui.theme import UIStyles
+from core.bus import bus
 from core.components.plugins.logic.manager import module_manager
 from core.services import monitor_service, vault_instance, db_instance
 
@@ -95,7 +96,46 @@ async def render_dashboard_page():
                     ui.label().classes('text-3xl font-black font-mono text-amber-400').bind_text_from(monitor_service.stats, 'disk', lambda v: f"{v:.1f}%")
                     disk_prog.bind_value_from(monitor_service.stats, 'disk', lambda v: v / 100.0)
 
-        # --- STACK 3: PLUGIN WIDGETS ---
+        # --- STACK 3: EVENT BUS ---
+        with ui.row().classes('items-center gap-2 mt-4'):
+            ui.element('div').classes('h-5 w-0.5 bg-gradient-to-b from-violet-400 to-fuchsia-400')
+            ui.label('Event Bus').classes(UIStyles.TITLE_H3)
+        with ui.card().classes(f'{UIStyles.CARD_GLASS} w-full').style('padding: 0; flex-wrap: nowrap'):
+            ui.element('div').classes('h-1 w-full bg-gradient-to-r from-violet-400 via-fuchsia-400 to-pink-400')
+            with ui.column().classes('w-full p-5 gap-3'):
+                with ui.row().classes('w-full gap-8'):
+                    with ui.column().classes('gap-0'):
+                        ui.label('In-flight Tasks').classes(UIStyles.LABEL_MINI)
+                        inflight_label = ui.label('0').classes('text-2xl font-black font-mono text-violet-400')
+                    with ui.column().classes('gap-0'):
+                        ui.label('Events Emitted').classes(UIStyles.LABEL_MINI)
+                        emits_label = ui.label('0').classes('text-2xl font-black font-mono text-fuchsia-400')
+                    with ui.column().classes('gap-0'):
+                        ui.label('Handler Failures').classes(UIStyles.LABEL_MINI)
+                        failures_label = ui.label('0').classes('text-2xl font-black font-mono text-red-400')
+                ui.label('Top handlers by total wall time').classes(UIStyles.LABEL_MINI)
+                handler_rows = ui.column().classes('w-full gap-1 font-mono text-xs')
+
+        def refresh_bus_metrics():
+            metrics = bus.get_metrics()
+            inflight_label.set_text(str(metrics['in_flight_tasks']))
+            emits_label.set_text(str(metrics['emits_total']))
+            failures_label.set_text(str(sum(h['failures'] for h in metrics['handlers'])))
+            handler_rows.clear()
+            with handler_rows:
+                if not metrics['handlers']:
+                    ui.label('No handler activity recorded yet.').classes(f'{UIStyles.TEXT_MUTED} italic')
+                for handler in metrics['handlers'][:5]:
+                    with ui.row().classes('w-full justify-between gap-4'):
+                        ui.label(f"{handler['topic']} → {handler['handler']}").classes('text-zinc-300 truncate')
+                        ui.label(
+                            f"{handler['count']}× avg {handler['avg_ms']:.1f} ms · p95 ≤{handler['p95_ms']:g} ms"
+                        ).classes('text-zinc-500 shrink-0')
+
+        refresh_bus_metrics()
+        ui.timer(2.0, refresh_bus_metrics)
+
+        # --- STACK 4: PLUGIN WIDGETS ---
         with ui.row().classes('items-center gap-2 mt-4'):
             ui.element('div').classes('h-5 w-0.5 bg-gradient-to-b from-rose-400 to-pink-400')
             ui.label('Module Integrations').classes(UIStyles.TITLE_H3)
@@ -1,9 +1,14 @@
 import asyncio
-from typing import Optional
+import time
+from typing import Dict, Optional
 from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from core.bus import bus
 from core.logger import get_logger
+from core.metrics import LatencyHistogram
 from config import settings
 
 log = get_logger("Core:DatabaseService")
@@ -18,25 +23,87 @@ _PERMANENT_ERROR_MARKERS = [
 ]
 
 
+class PoolMetrics:
+    """Checkout wait-time histogram and timeout counter of one engine's pool."""
+
+    def __init__(self):
+        self.wait = LatencyHistogram()
+        self.timeouts = 0
+
+    def pool_class(self, base):
+        """A subclass of `base` that times every checkout (including opening overflow connections)."""
+        metrics = self
+
+        class TimedPool(base):
+            def _do_get(self):
+                started = time.perf_counter()
+                try:
+                    return super()._do_get()
+                except PoolTimeoutError:
+                    metrics.timeouts += 1
+                    raise
+                finally:
+                    metrics.wait.observe(time.perf_counter() - started)
+
+        return TimedPool
+
+    def snapshot(self, pool) -> Dict:
+        stats = {"wait": self.wait.snapshot(), "timeouts": self.timeouts}
+        if pool is not None:
+            stats.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                # QueuePool counts overflow from -size; only connections beyond the pool size matter here
+                "overflow": max(0, pool.overflow()),
+                "max_overflow": settings.DB_MAX_OVERFLOW,
+            })
+        return stats
+
+
 class DatabaseService:
     def __init__(self):
         self.engine = None
         self.SessionLocal = None
+        # Async engine for queries on the event loop (UI handlers, bus handlers)
+        self.async_engine = None
+        self.AsyncSessionLocal = None
         self.is_connected = False
         self._connection_task: Optional[asyncio.Task] = None
         self._watchdog_task: Optional[asyncio.Task] = None
         self._max_retries = 30  # ~2.5 minutes with 5s intervals
+        # Kept across engine rebuilds so the histograms cover the whole process lifetime
+        self.pool_metrics = {"sync": PoolMetrics(), "async": PoolMetrics()}
         bus.subscribe("vault:opened")(self.init_db_connection)
+        bus.subscribe("db:connected")(self._warm_pools)
+
+    @staticmethod
+    def _pool_options() -> dict:
+        return {
+            "pool_pre_ping": True,
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "connect_args": {'connect_timeout': settings.DB_CONNECT_TIMEOUT},
+        }
 
     async def init_db_connection(self, payload=None):
         log.info(f"DATABASE: Vault is open. Initializing engine for {settings.DATABASE_URL_SAFE}")
         try:
             self.engine = create_engine(
                 settings.DATABASE_URL,
-                pool_pre_ping=True,
-                connect_args={'connect_timeout': 5}
+                poolclass=self.pool_metrics["sync"].pool_class(QueuePool),
+                **self._pool_options()
             )
             self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+            self.async_engine = create_async_engine(
+                settings.DATABASE_URL_ASYNC,
+                poolclass=self.pool_metrics["async"].pool_class(AsyncAdaptedQueuePool),
+                **self._pool_options()
+            )
+            # expire_on_commit=False: objects stay readable after commit without a lazy reload
+            self.AsyncSessionLocal = async_sessionmaker(self.async_engine, autoflush=False, expire_on_commit=False)
 
             self._connection_task = bus.create_tracked_task(
                 self._connection_loop(),
@@ -84,6 +151,35 @@ class DatabaseService:
                 log.warning(f"RETRY: Database not reachable (attempt {attempt}/{self._max_retries}). Retrying in 5s...")
                 await asyncio.sleep(5)
 
+    async def _warm_pools(self, payload=None):
+        """Opens DB_POOL_WARMUP connections per engine at once and returns them to the pool."""
+        count = min(settings.DB_POOL_WARMUP, settings.DB_POOL_SIZE)
+        if count <= 0 or not self.engine or not self.async_engine:
+            return
+        started = time.perf_counter()
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self._warm_sync_pool, count)
+            connections = await asyncio.gather(*(self.async_engine.connect() for _ in range(count)))
+            for connection in connections:
+                await connection.close()
+            log.info(f"POOL: Warmed {count} connection(s) per engine in {(time.perf_counter() - started) * 1000:.0f}ms")
+        except Exception as e:
+            log.warning(f"POOL: Warmup failed, connections will be opened on demand: {self._redact_error(str(e))}")
+
+    def _warm_sync_pool(self, count: int):
+        connections = [self.engine.connect() for _ in range(count)]
+        for connection in connections:
+            connection.close()
+
+    def get_pool_stats(self) -> Dict:
+        """Pool gauges (size, checked out, idle, overflow) and checkout wait histograms per engine."""
+        return {
+            "sync": self.pool_metrics["sync"].snapshot(self.engine.pool if self.engine else None),
+            "async": self.pool_metrics["async"].snapshot(
+                self.async_engine.sync_engine.pool if self.async_engine else None
+            ),
+        }
+
     def _check_db_sync(self):
         """Synchronous helper for DB health check (runs in executor)."""
         with self.engine.connect() as conn:
@@ -99,6 +195,8 @@ class DatabaseService:
             except Exception as e:
                 log.error(f"LOST: Database connection failed: {self._redact_error(str(e))}")
                 self.is_connected = False
+                # Late subscribers must not be told the DB is ready while it is down
+                bus.clear_sticky("db:connected")
                 self._connection_task = bus.create_tracked_task(
                     self._connection_loop(),
                     name="db_service:reconnect"
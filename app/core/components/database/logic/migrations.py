@@ -0,0 +1,259 @@
+"""
+Versioned schema migrations for core components and plugins.
+
+Each component (e.g. 'core.plugins' or a plugin's manifest id) registers an
+ordered list of Migration steps plus the tables it owns. The schema_versions
+table stores the applied version and a fingerprint (hash of the steps and of
+the tables' DDL) per component. When every registered component is known to
+be current, upgrade() is a dict comparison: no reflection, no DDL, no query.
+
+Tables on Base.metadata that no component owns (plugin models without
+migrations) keep the old create_all behaviour, but only when their combined
+fingerprint changes.
+
+A component whose step fails is retried by a later upgrade() with exponential
+backoff, and right away after the next 'db:connected'.
+"""
+import asyncio
+import hashlib
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, select
+from sqlalchemy.dialects import mysql
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.schema import CreateTable
+
+from core.bus import bus
+from core.logger import get_logger
+from .db_service import Base, db_instance
+
+log = get_logger("Core:Migrations")
+
+# Deliberately not on Base.metadata: it is managed here, never by create_all
+_version_metadata = MetaData()
+schema_versions = Table(
+    "schema_versions",
+    _version_metadata,
+    Column("component", String(150), primary_key=True),
+    Column("version", Integer, nullable=False),
+    Column("fingerprint", String(64), nullable=True),
+    Column("applied_at", DateTime, nullable=True),
+)
+
+UNOWNED_COMPONENT = "core.metadata"
+# Components whose failure stops the core instead of only blocking one plugin
+CORE_COMPONENT_PREFIX = "core."
+# Seconds before a failed component is retried; doubled per failure up to the max
+RETRY_BACKOFF_INITIAL = 5.0
+RETRY_BACKOFF_MAX = 300.0
+
+
+class MigrationError(RuntimeError):
+    """Raised by upgrade() while a core component's schema migration has failed."""
+
+
+class Migration:
+    """One schema step. `upgrade(connection)` receives a sync SQLAlchemy Connection."""
+    __slots__ = ("version", "description", "upgrade")
+
+    def __init__(self, version: int, description: str, upgrade: Callable):
+        self.version = version
+        self.description = description
+        self.upgrade = upgrade
+
+
+def _tables_fingerprint(tables: Iterable[Table]) -> List[str]:
+    return [str(CreateTable(table).compile(dialect=mysql.dialect())) for table in sorted(tables, key=lambda t: t.name)]
+
+
+class MigrationRunner:
+    def __init__(self):
+        self._components: Dict[str, Tuple[List[Migration], Tuple[Table, ...]]] = {}
+        self._targets: Dict[str, Tuple[int, str]] = {}
+        self._unowned_cache: Tuple[Optional[frozenset], Optional[Tuple[int, str]]] = (None, None)
+        # component -> (version, fingerprint) known to be in the database
+        self._applied: Dict[str, Tuple[int, str]] = {}
+        # component -> error of its last failed step
+        self.failed: Dict[str, str] = {}
+        # component -> (monotonic time of the next retry, current backoff) for failed components
+        self._retry_at: Dict[str, Tuple[float, float]] = {}
+        self._lock = asyncio.Lock()
+        bus.subscribe("db:connected")(self._on_db_connected)
+
+    def register(self, component: str, migrations: Iterable[Migration], tables: Iterable[Table] = ()):
+        migrations = sorted(migrations, key=lambda migration: migration.version)
+        versions = [migration.version for migration in migrations]
+        if len(set(versions)) != len(versions) or any(version < 1 for version in versions):
+            raise ValueError(f"Migrations of '{component}' need unique versions >= 1, got {versions}")
+        self._components[component] = (migrations, tuple(tables))
+        self._targets[component] = self._compute_target(component)
+        self._applied.pop(component, None)
+        self.failed.pop(component, None)
+        self._retry_at.pop(component, None)
+
+    def unregister(self, component: str):
+        self._components.pop(component, None)
+        self._targets.pop(component, None)
+        self._applied.pop(component, None)
+        self.failed.pop(component, None)
+        self._retry_at.pop(component, None)
+
+    def retry_failed(self):
+        """Makes every failed component due for a retry on the next upgrade()."""
+        self._retry_at = {component: (0.0, backoff) for component, (_, backoff) in self._retry_at.items()}
+
+    async def _on_db_connected(self, payload=None):
+        # Failures are often transient connection errors: retry them on the fresh connection
+        if self.failed:
+            log.info(f"MIGRATIONS: Retrying failed component(s) after reconnect: {', '.join(self.failed)}")
+            self.retry_failed()
+
+    def _waiting_for_retry(self, component: str) -> bool:
+        return component in self.failed and time.monotonic() < self._retry_at[component][0]
+
+    def _target(self, component: str) -> Tuple[int, str]:
+        return self._targets[component]
+
+    def _compute_target(self, component: str) -> Tuple[int, str]:
+        migrations, tables = self._components[component]
+        digest = hashlib.sha256()
+        for migration in migrations:
+            digest.update(f"{migration.version}:{migration.description}\n".encode("utf-8"))
+        for ddl in _tables_fingerprint(tables):
+            digest.update(ddl.encode("utf-8"))
+        return (migrations[-1].version if migrations else 0), digest.hexdigest()
+
+    def _unowned_tables(self) -> List[Table]:
+        owned = {table.name for _, tables in self._components.values() for table in tables}
+        return [table for table in Base.metadata.sorted_tables if table.name not in owned]
+
+    def _unowned_target(self) -> Tuple[int, str]:
+        # Plugins can add models at any time; recompute only when the set of tables changed
+        key = frozenset(Base.metadata.tables) | frozenset(self._components)
+        cached_key, target = self._unowned_cache
+        if cached_key != key:
+            ddl = "".join(_tables_fingerprint(self._unowned_tables()))
+            target = (1, hashlib.sha256(ddl.encode("utf-8")).hexdigest())
+            self._unowned_cache = (key, target)
+        return target
+
+    def _is_current(self) -> bool:
+        if self._applied.get(UNOWNED_COMPONENT) != self._unowned_target():
+            return False
+        # Failed components count as current until their backoff has elapsed
+        return all(
+            self._waiting_for_retry(component) or self._applied.get(component) == self._target(component)
+            for component in self._components
+        )
+
+    async def upgrade(self):
+        """Brings every registered component to its latest version.
+
+        Once everything is current this returns without touching the database,
+        so it is cheap to call before any code that needs the tables. Raises
+        MigrationError while a core component is not migrated; failed plugin
+        components are listed in `failed` and their plugins stay inactive.
+        Failed components are retried once their backoff has elapsed.
+        """
+        if not self._is_current() and db_instance.async_engine:
+            async with self._lock:
+                if not self._is_current():
+                    async with db_instance.async_engine.connect() as connection:
+                        await connection.run_sync(self._upgrade_sync)
+
+        failed_core = {
+            component: error for component, error in self.failed.items()
+            if component.startswith(CORE_COMPONENT_PREFIX)
+        }
+        if failed_core:
+            details = "; ".join(f"{component}: {error}" for component, error in failed_core.items())
+            raise MigrationError(f"Core schema migrations failed ({details})")
+
+    # --- SYNC PART (runs via AsyncConnection.run_sync) ---
+
+    def _upgrade_sync(self, connection):
+        stored = self._read_versions(connection)
+        for component in list(self._components):
+            if self._waiting_for_retry(component):
+                continue
+            self._upgrade_component(connection, component, stored.get(component, (0, None)))
+
+        target = self._unowned_target()
+        if stored.get(UNOWNED_COMPONENT, (0, None)) != target:
+            tables = self._unowned_tables()
+            if tables:
+                log.info(f"MIGRATIONS: Creating missing tables without migrations: {', '.join(t.name for t in tables)}")
+                Base.metadata.create_all(bind=connection, tables=tables, checkfirst=True)
+            self._write_version(connection, UNOWNED_COMPONENT, *target)
+        self._applied[UNOWNED_COMPONENT] = target
+
+    def _upgrade_component(self, connection, component: str, current: Tuple[int, Optional[str]]):
+        migrations, _ = self._components[component]
+        target_version, fingerprint = self._target(component)
+        current_version, current_fingerprint = current
+
+        if current_version > target_version:
+            log.warning(
+                f"MIGRATIONS: '{component}' is at version {current_version}, newer than this code "
+                f"({target_version}). Leaving it untouched."
+            )
+            self.failed.pop(component, None)
+            self._retry_at.pop(component, None)
+            self._applied[component] = (target_version, fingerprint)
+            return
+
+        try:
+            for migration in migrations:
+                if migration.version <= current_version:
+                    continue
+                log.info(f"MIGRATIONS: {component} -> v{migration.version}: {migration.description}")
+                migration.upgrade(connection)
+                # Committed per step: MySQL DDL is not transactional anyway
+                self._write_version(connection, component, migration.version, fingerprint)
+            if current_version == target_version and current_fingerprint != fingerprint:
+                if current_fingerprint:
+                    log.warning(f"MIGRATIONS: Schema of '{component}' changed without a new migration version.")
+                self._write_version(connection, component, target_version, fingerprint)
+        except Exception as e:
+            connection.rollback()
+            # Not marked as applied: the schema is behind until a retry succeeds
+            _, backoff = self._retry_at.get(component, (0.0, RETRY_BACKOFF_INITIAL / 2))
+            backoff = min(backoff * 2, RETRY_BACKOFF_MAX)
+            self._retry_at[component] = (time.monotonic() + backoff, backoff)
+            self.failed[component] = str(e)
+            log.error(f"MIGRATIONS: '{component}' failed, retrying in {backoff:g}s: {e}", exc_info=True)
+            return
+        self.failed.pop(component, None)
+        self._retry_at.pop(component, None)
+        self._applied[component] = (target_version, fingerprint)
+
+    @staticmethod
+    def _read_versions(connection) -> Dict[str, Tuple[int, Optional[str]]]:
+        try:
+            with connection.begin_nested():
+                rows = connection.execute(
+                    select(schema_versions.c.component, schema_versions.c.version, schema_versions.c.fingerprint)
+                ).all()
+        except (ProgrammingError, OperationalError):
+            # First start with the migration runner: the table does not exist yet
+            schema_versions.create(bind=connection, checkfirst=True)
+            connection.commit()
+            return {}
+        return {component: (version, fingerprint) for component, version, fingerprint in rows}
+
+    @staticmethod
+    def _write_version(connection, component: str, version: int, fingerprint: str):
+        statement = mysql.insert(schema_versions).values(
+            component=component, version=version, fingerprint=fingerprint, applied_at=datetime.now(timezone.utc)
+        )
+        connection.execute(statement.on_duplicate_key_update(
+            version=statement.inserted.version,
+            fingerprint=statement.inserted.fingerprint,
+            applied_at=statement.inserted.applied_at,
+        ))
+        connection.commit()
+
+
+schema_migrations = MigrationRunner()
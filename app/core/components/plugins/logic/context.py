@@ -1,12 +1,21 @@
 from collections import defaultdict
+import asyncio
 import threading
 
 import hvac
-from core.bus import bus as global_bus
+from core.bus import bus as global_bus, topic_matches
 from core.logger import get_logger
 from core.services import vault_instance
 from .models import ModuleManifest
 
+# How long cancel_tasks() waits for cancelled tasks to finish their cleanup
+TASK_CANCEL_TIMEOUT_SECONDS = 5.0
+
+
+class TaskQuotaExceeded(RuntimeError):
+    """Raised by ModuleContext.create_task when a module has too many tasks waiting."""
+
+
 class ModuleContext:
     """
     Der isolierte Sandkasten für JEDES Modul (Core & Plugin).
@@ -19,29 +28,158 @@ class ModuleContext:
         prefix = "Core" if manifest.type == "CORE" else "Plugin"
         self.log = get_logger(f"{prefix}:{manifest.name}")
         self.state = {}
+        # Task quota: at most max_concurrent_tasks run, max_pending_tasks may wait for a slot
+        self._task_slots = asyncio.Semaphore(manifest.max_concurrent_tasks)
+        self._tasks = set()
+        self._task_counts = {"running": 0, "waiting": 0, "completed": 0, "failed": 0, "cancelled": 0, "rejected": 0}
 
     # --- EVENT BUS PROXY ---
 
-    def subscribe(self, topic: str):
+    @staticmethod
+    def _is_permitted(topic: str, allowed: list) -> bool:
+        """'*' grants everything; other entries may be exact topics or patterns like 'monitoring:*'."""
+        return "*" in allowed or any(topic_matches(rule, topic) for rule in allowed)
+
+    def subscribe(self, topic: str, replay: bool = True, weak: bool = False, batch: bool = False):
+        """Subscribes to a topic or pattern ('monitoring:*', 'plugin:**') covered by the manifest.
+
+        Sticky topics (e.g. 'db:connected') that already fired are replayed to the callback.
+        Subscriptions are released automatically when the module is disabled or unloaded;
+        weak=True additionally lets a bound method's instance be garbage collected;
+        batch=True delivers ctx.emit_many() batches as one tuple.
+        """
         def decorator(callback):
-            if topic in self.manifest.permissions.subscribe or "*" in self.manifest.permissions.subscribe:
+            if self._is_permitted(topic, self.manifest.permissions.subscribe):
                 self.log.debug(f"SUBSCRIBE: Subscribed to topic: {topic}")
-                global_bus.subscribe(topic)(callback)
+                global_bus.subscribe(topic, replay=replay, owner=self.manifest.id, weak=weak, batch=batch)(callback)
             else:
                 self.log.warning(f"PERMISSION: Module not allowed to subscribe to '{topic}'!")
             return callback
         return decorator
 
-    def emit(self, topic: str, payload: dict = None):
-        if topic in self.manifest.permissions.emit or "*" in self.manifest.permissions.emit:
-            global_bus.emit(topic, payload)
+    def emit(self, topic: str, payload: dict = None, readonly: bool = False):
+        if self._is_permitted(topic, self.manifest.permissions.emit):
+            global_bus.emit(topic, payload, readonly=readonly)
         else:
             self.log.warning(f"PERMISSION: Module not allowed to emit '{topic}'!")
 
+    def emit_many(self, topic: str, payloads, readonly: bool = False):
+        """Emits a batch of events on `topic` with one dispatch per subscriber. See GlobalEventBus.emit_many."""
+        if self._is_permitted(topic, self.manifest.permissions.emit):
+            global_bus.emit_many(topic, payloads, readonly=readonly)
+        else:
+            self.log.warning(f"PERMISSION: Module not allowed to emit '{topic}'!")
+
+    def respond(self, topic: str):
+        """Answers ctx.request()/bus.request() calls on `topic` with the handler's return value."""
+        def decorator(callback):
+            if self._is_permitted(topic, self.manifest.permissions.subscribe):
+                self.log.debug(f"RESPOND: Responding to topic: {topic}")
+                global_bus.respond(topic, owner=self.manifest.id)(callback)
+            else:
+                self.log.warning(f"PERMISSION: Module not allowed to respond to '{topic}'!")
+            return callback
+        return decorator
+
+    async def request(self, topic: str, payload: dict = None, timeout: float = 5.0):
+        """Awaits the first reply to `topic`; needs emit permission. See GlobalEventBus.request."""
+        if not self._is_permitted(topic, self.manifest.permissions.emit):
+            raise PermissionError(f"Module not allowed to request '{topic}'")
+        return await global_bus.request(topic, payload, timeout=timeout)
+
+    async def request_all(self, topic: str, payload: dict = None, timeout: float = 5.0):
+        """Gathers replies from every responder of `topic`; needs emit permission."""
+        if not self._is_permitted(topic, self.manifest.permissions.emit):
+            raise PermissionError(f"Module not allowed to request '{topic}'")
+        return await global_bus.request_all(topic, payload, timeout=timeout)
+
+    def register_event_summarizer(self, topic: str, summarizer):
+        """Registers a compact payload renderer for EVENT log lines of a topic this module may emit or subscribe to."""
+        permissions = self.manifest.permissions
+        if self._is_permitted(topic, permissions.emit) or self._is_permitted(topic, permissions.subscribe):
+            global_bus.register_summarizer(topic, summarizer, owner=self.manifest.id)
+        else:
+            self.log.warning(f"PERMISSION: Module not allowed to register a summarizer for '{topic}'!")
+
+    def unsubscribe(self, topic: str, callback) -> bool:
+        return global_bus.unsubscribe(topic, callback)
+
     def create_task(self, coro, *, name: str = None):
-        """Create an observed background task owned by this module."""
+        """Create an observed background task owned by this module.
+
+        At most `manifest.max_concurrent_tasks` run at once; further tasks wait for a
+        slot. Raises TaskQuotaExceeded once `manifest.max_pending_tasks` are waiting.
+        """
+        counts = self._task_counts
+        if counts["running"] + counts["waiting"] >= self.manifest.max_concurrent_tasks + self.manifest.max_pending_tasks:
+            counts["rejected"] += 1
+            coro.close()
+            self.log.warning(
+                f"TASK_QUOTA: Rejected task '{name or 'unnamed'}': {counts['running']} running, "
+                f"{counts['waiting']} waiting (limits {self.manifest.max_concurrent_tasks}/{self.manifest.max_pending_tasks})"
+            )
+            raise TaskQuotaExceeded(f"Module '{self.manifest.id}' has too many pending tasks")
+
         task_name = name or f"module:{self.manifest.id}"
-        return global_bus.create_tracked_task(coro, name=task_name)
+        counts["waiting"] += 1
+        # Shared with the wrapper so the done-callback knows whether `coro` ever started
+        state = {"started": False}
+        task = global_bus.create_tracked_task(self._run_with_slot(coro, state), name=task_name)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        task.add_done_callback(lambda done: self._task_finished(done, coro, state))
+        return task
+
+    async def _run_with_slot(self, coro, state: dict):
+        await self._task_slots.acquire()
+        state["started"] = True
+        self._task_counts["waiting"] -= 1
+        self._task_counts["running"] += 1
+        try:
+            return await coro
+        finally:
+            self._task_slots.release()
+
+    def _task_finished(self, task: asyncio.Task, coro, state: dict):
+        """Quota accounting in a done-callback: it also runs for tasks cancelled before their first step."""
+        counts = self._task_counts
+        if state["started"]:
+            counts["running"] -= 1
+        else:
+            counts["waiting"] -= 1
+            coro.close()
+        if task.cancelled():
+            counts["cancelled"] += 1
+        elif task.exception() is not None:
+            counts["failed"] += 1
+        else:
+            counts["completed"] += 1
+
+    async def cancel_tasks(self) -> int:
+        """Cancels every unfinished task started via create_task and waits for them to end.
+
+        Returns the number of cancelled tasks. Tasks that ignore the cancellation are
+        logged after TASK_CANCEL_TIMEOUT_SECONDS and left behind.
+        """
+        current = asyncio.current_task()
+        tasks = [task for task in self._tasks if not task.done() and task is not current]
+        if not tasks:
+            return 0
+        for task in tasks:
+            task.cancel()
+        _, still_running = await asyncio.wait(tasks, timeout=TASK_CANCEL_TIMEOUT_SECONDS)
+        if still_running:
+            self.log.warning(f"TASKS: {len(still_running)} task(s) did not stop after cancellation.")
+        self.log.info(f"TASKS: Cancelled {len(tasks)} background task(s).")
+        return len(tasks)
+
+    def task_stats(self) -> dict:
+        """Current task counts and limits of this module."""
+        return {
+            **self._task_counts,
+            "max_concurrent": self.manifest.max_concurrent_tasks,
+            "max_pending": self.manifest.max_pending_tasks,
+        }
 
     # --- VAULT PROXY (Hier war der Einrückungsfehler) ---
 
@@ -1,6 +1,7 @@
 import os
 import sys
 import importlib
+import importlib.util
 from pathlib import Path
 import inspect
 import asyncio
@@ -9,16 +10,44 @@ from sqlalchemy import inspect as sqlalchemy_inspect, text
 from core.logger import get_logger
 from core.bus import bus
 from core.components.database.logic.db_service import db_instance
+from core.components.database.logic.migrations import Migration, MigrationError, schema_migrations
 from .models import ModuleManifest, PluginState
 from .context import ModuleContext
+from .state_repository import plugin_states
 from config import settings
 
 log = get_logger("Core:ModuleManager")
 
+
+def _create_plugin_states(connection):
+    PluginState.__table__.create(bind=connection, checkfirst=True)
+
+
+def _add_plugin_state_version_columns(connection):
+    """Columns added after the first release; older installs may lack any of them."""
+    required_columns = {
+        "installed_version": "VARCHAR(50) NULL",
+        "desired_version": "VARCHAR(50) NULL",
+        "repo_url": "VARCHAR(500) NULL",
+        "auto_update": "BOOLEAN DEFAULT 0",
+    }
+    existing_columns = {
+        column["name"] for column in sqlalchemy_inspect(connection).get_columns(PluginState.__tablename__)
+    }
+    for column_name, ddl in required_columns.items():
+        if column_name not in existing_columns:
+            log.warning(f"PLUGIN_MANAGER: Migrating plugin_states table, adding column '{column_name}'.")
+            connection.execute(text(f"ALTER TABLE {PluginState.__tablename__} ADD COLUMN {column_name} {ddl}"))
+
+
 class ModuleManager:
     def __init__(self):
         self.registry = {}
-        self._plugin_state_schema_ready = False
+        self._activation_subscribed = False
+        schema_migrations.register("core.plugins", [
+            Migration(1, "create plugin_states table", _create_plugin_states),
+            Migration(2, "add version tracking columns to plugin_states", _add_plugin_state_version_columns),
+        ], tables=[PluginState.__table__])
         current_file_path = os.path.abspath(__file__)
         self.base_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(current_file_path)))))
         # Subscribe to filesystem change events from the PluginService
@@ -61,14 +90,16 @@ class ModuleManager:
         
         # --- THE CRITICAL TIMING FIX ---
         # Now that the registry is fully populated, we can safely read the DB states.
-        if db_instance.is_connected:
-            bus.create_tracked_task(
-                self._activate_saved_plugins(),
-                name="module_manager:activate_plugins"
-            )
-        else:
-            log.warning("PLUGIN_MANAGER: DB not connected at end of load_all. Falling back to bus listener.")
-            bus.subscribe("db:connected")(self._activate_saved_plugins)
+        # 'db:connected' is sticky: if the DB is already up, the bus replays the event
+        # right away; otherwise activation runs as soon as it connects.
+        # load_all() runs again on every 'iam:ready' (i.e. after each DB reconnect); subscribing
+        # only once keeps reconnects from stacking activation runs that could call setup() twice.
+        if self._activation_subscribed:
+            return
+        if not db_instance.is_connected:
+            log.warning("PLUGIN_MANAGER: DB not connected at end of load_all. Activation waits for 'db:connected'.")
+        self._activation_subscribed = True
+        bus.subscribe("db:connected")(self._activate_saved_plugins)
 
     def _scan_directory(self, package_prefix: str, directory: str, is_plugin: bool):
         if not os.path.exists(directory):
@@ -152,6 +183,9 @@ class ModuleManager:
             if manifest.id in self.registry:
                 return False
 
+            if is_plugin:
+                self._register_plugin_migrations(module_name, manifest)
+
             ctx = ModuleContext(manifest)
 
             # Register as initializing/parked
@@ -201,11 +235,24 @@ class ModuleManager:
 
             resolved_module_id = self._find_plugin_id_by_folder(module_name)
             if resolved_module_id:
-                self._persist_plugin_state(resolved_module_id, True)
+                await self._persist_plugin_state(resolved_module_id, True)
                 await self._activate_saved_plugins()
         elif action == "uninstall":
             module_id = payload.get("id")
-            self.unload_module(module_id)
+            await self.unload_module(module_id)
+
+    def _register_plugin_migrations(self, module_name: str, manifest: ModuleManifest):
+        """Registers MIGRATIONS (and the TABLES they own, if declared) from the plugin's migrations.py."""
+        migrations_path = f"plugins.{module_name}.migrations"
+        if importlib.util.find_spec(migrations_path) is None:
+            return
+        migrations_module = importlib.import_module(migrations_path)
+        schema_migrations.register(
+            manifest.id,
+            getattr(migrations_module, "MIGRATIONS", []),
+            tables=getattr(migrations_module, "TABLES", ()),
+        )
+        log.debug(f"MIGRATIONS: Registered schema migrations of '{manifest.id}'")
 
     def _execute_setup(self, module_id):
         """Helper to safely execute the module's setup function."""
@@ -229,33 +276,38 @@ class ModuleManager:
                 module.setup(ctx)
                 entry["status"] = "active"
 
-    def _persist_plugin_state(self, module_id: str, is_active: bool):
+    async def _persist_plugin_state(self, module_id: str, is_active: bool):
         """Persist plugin activation without duplicating lifecycle work."""
-        if module_id not in self.registry or not db_instance.SessionLocal:
+        if module_id not in self.registry or not db_instance.AsyncSessionLocal:
             return
 
-        self._ensure_plugin_state_schema()
+        try:
+            await schema_migrations.upgrade()
+        except MigrationError as e:
+            log.error(f"DB_ERROR: Not persisting plugin state for '{module_id}': {e}")
+            return
         manifest = self.registry[module_id]["manifest"]
 
         try:
-            with db_instance.SessionLocal() as session:
-                db_state = session.query(PluginState).filter(PluginState.module_id == module_id).first()
-                if not db_state:
-                    db_state = PluginState(
-                        module_id=module_id,
-                        is_active=is_active,
-                        installed_version=manifest.version,
-                        desired_version=manifest.version,
-                        repo_url=manifest.repo_url,
-                        auto_update=settings.LYNDRIX_PLUGINS_AUTO_UPDATE,
-                    )
-                    session.add(db_state)
-                else:
-                    db_state.is_active = is_active
-                    db_state.installed_version = manifest.version
-                    db_state.desired_version = manifest.version
-                    db_state.repo_url = manifest.repo_url or db_state.repo_url
-                session.commit()
+            await plugin_states.ensure_loaded()
+            db_state = plugin_states.get(module_id)
+            if not db_state:
+                await plugin_states.save(
+                    module_id,
+                    is_active=is_active,
+                    installed_version=manifest.version,
+                    desired_version=manifest.version,
+                    repo_url=manifest.repo_url,
+                    auto_update=settings.LYNDRIX_PLUGINS_AUTO_UPDATE,
+                )
+            else:
+                await plugin_states.save(
+                    module_id,
+                    is_active=is_active,
+                    installed_version=manifest.version,
+                    desired_version=manifest.version,
+                    repo_url=manifest.repo_url or db_state["repo_url"],
+                )
         except Exception as e:
             log.error(f"DB_ERROR: Failed to persist plugin state for '{module_id}': {e}")
 
@@ -271,54 +323,67 @@ class ModuleManager:
         """Called when DB connects. Reads states and boots active plugins."""
         log.info("PLUGIN_MANAGER: Verifying plugin states from Database...")
 
-        if not db_instance.SessionLocal:
-            log.error("PLUGIN_MANAGER: SessionLocal missing during DB activation.")
+        if not db_instance.AsyncSessionLocal:
+            log.error("PLUGIN_MANAGER: AsyncSessionLocal missing during DB activation.")
             return
 
-        self._ensure_plugin_state_schema()
+        try:
+            await schema_migrations.upgrade()
+        except MigrationError as e:
+            log.error(f"PLUGIN_MANAGER: Plugins stay inactive, the core schema is not migrated: {e}")
+            return
 
         enabled_plugin_ids = []
 
-        with db_instance.SessionLocal() as session:
-            for module_id, entry in self.registry.items():
-                if entry["manifest"].type == "CORE":
-                    continue
+        # All rows are read once per process; the per-module lookups below are RAM hits
+        await plugin_states.ensure_loaded()
 
-                manifest = entry["manifest"]
-                db_state = session.query(PluginState).filter(PluginState.module_id == module_id).first()
-
-                if not db_state:
-                    db_state = PluginState(
-                        module_id=module_id,
-                        is_active=manifest.auto_enable_on_install,
-                        installed_version=manifest.version,
-                        desired_version=manifest.version,
-                        repo_url=manifest.repo_url,
-                        auto_update=settings.LYNDRIX_PLUGINS_AUTO_UPDATE,
+        for module_id, entry in self.registry.items():
+            if entry["manifest"].type == "CORE":
+                continue
+
+            manifest = entry["manifest"]
+            db_state = plugin_states.get(module_id)
+
+            if not db_state:
+                plugin_states.stage(
+                    module_id,
+                    is_active=manifest.auto_enable_on_install,
+                    installed_version=manifest.version,
+                    desired_version=manifest.version,
+                    repo_url=manifest.repo_url,
+                    auto_update=settings.LYNDRIX_PLUGINS_AUTO_UPDATE,
+                )
+            else:
+                plugin_states.stage(
+                    module_id,
+                    installed_version=manifest.version,
+                    repo_url=manifest.repo_url or db_state["repo_url"],
+                    desired_version=db_state["desired_version"] or manifest.version,
+                )
+            # New rows only reach the cache once flushed; use the value just staged
+            is_active = db_state["is_active"] if db_state else manifest.auto_enable_on_install
+
+            if is_active and module_id in schema_migrations.failed:
+                entry["status"] = "blocked"
+                log.error(f"DB_RESTORE: Plugin '{module_id}' stays inactive, its schema migrations failed.")
+            elif is_active:
+                enabled_plugin_ids.append(module_id)
+                if not self._check_dependencies_met(manifest):
+                    entry["status"] = "blocked"
+                    log.warning(
+                        f"DB_RESTORE: Plugin '{module_id}' is enabled but waiting for dependencies."
                     )
-                    session.add(db_state)
-                else:
-                    db_state.installed_version = manifest.version
-                    db_state.repo_url = manifest.repo_url or db_state.repo_url
-                    if not db_state.desired_version:
-                        db_state.desired_version = manifest.version
-
-                if db_state.is_active:
-                    enabled_plugin_ids.append(module_id)
-                    if not self._check_dependencies_met(manifest):
-                        entry["status"] = "blocked"
-                        log.warning(
-                            f"DB_RESTORE: Plugin '{module_id}' is enabled but waiting for dependencies."
-                        )
-                    elif entry.get("status") != "active":
-                        log.info(f"DB_RESTORE: Activating plugin '{module_id}'")
-                        self._execute_setup(module_id)
-                else:
-                    if entry.get("status") != "disabled":
-                        log.info(f"DB_RESTORE: Plugin '{module_id}' remains disabled.")
-                        entry["status"] = "disabled"
+                elif entry.get("status") != "active":
+                    log.info(f"DB_RESTORE: Activating plugin '{module_id}'")
+                    self._execute_setup(module_id)
+            else:
+                if entry.get("status") != "disabled":
+                    log.info(f"DB_RESTORE: Plugin '{module_id}' remains disabled.")
+                    entry["status"] = "disabled"
 
-            session.commit()
+        # Inserts and changed rows go out as one upsert in a single commit
+        await plugin_states.flush()
 
         pending_enabled = set(enabled_plugin_ids)
         while pending_enabled:
@@ -346,24 +411,21 @@ class ModuleManager:
         # After restoring known plugins, reconcile desired plugins from config
         await self.reconcile_desired_plugins()
 
-    def toggle_module(self, module_id: str, active: bool):
+    async def toggle_module(self, module_id: str, active: bool):
         """Toggles the module state in RAM and persists it to the DB."""
         if module_id not in self.registry:
             return False
 
-        self._ensure_plugin_state_schema()
+        try:
+            await schema_migrations.upgrade()
+        except MigrationError as e:
+            log.error(f"DB_ERROR: Cannot toggle '{module_id}', the core schema is not migrated: {e}")
+            return False
             
         # 1. Persist to DB
-        if db_instance.SessionLocal:
+        if db_instance.AsyncSessionLocal:
             try:
-                with db_instance.SessionLocal() as session:
-                    db_state = session.query(PluginState).filter(PluginState.module_id == module_id).first()
-                    if not db_state:
-                        db_state = PluginState(module_id=module_id, is_active=active)
-                        session.add(db_state)
-                    else:
-                        db_state.is_active = active
-                    session.commit()
+                await plugin_states.save(module_id, is_active=active)
             except Exception as e:
                 log.error(f"DB_ERROR: Failed to save toggle state: {e}")
                 return False
@@ -373,7 +435,10 @@ class ModuleManager:
 
         if active:
             manifest = entry["manifest"]
-            if not self._check_dependencies_met(manifest):
+            if module_id in schema_migrations.failed:
+                entry["status"] = "blocked"
+                log.error(f"MODULE: Plugin '{module_id}' was enabled but its schema migrations failed.")
+            elif not self._check_dependencies_met(manifest):
                 entry["status"] = "blocked"
                 log.warning(
                     f"MODULE: Plugin '{module_id}' was enabled but is waiting for dependencies."
@@ -387,7 +452,9 @@ class ModuleManager:
             entry["status"] = "disabled"
             log.info(f"MODULE: 🔴 '{module_id}' is now DISABLED")
             # "Soft" unload: remove UI and call teardown, but keep module in memory.
+            # Bus handlers go too; setup() registers them again on re-activation.
             self._teardown_ui(module_id)
+            bus.unsubscribe_owner(module_id)
             entry = self.registry.get(module_id)
             if entry and hasattr(entry["module"], 'teardown'):
                 log.info(f"TEARDOWN: Executing teardown function for '{module_id}'")
@@ -399,6 +466,8 @@ class ModuleManager:
                     )
                 else:
                     teardown_func(entry["context"])
+            if entry:
+                await entry["context"].cancel_tasks()
 
             bus.emit("ui:needs_refresh", {"reason": f"Plugin {module_id} deactivated."})
             
@@ -423,12 +492,17 @@ class ModuleManager:
             except Exception as e:
                 log.error(f"TEARDOWN_ERROR: Failed to remove UI for '{module_id}': {e}")
 
-    def unload_module(self, module_id: str):
+    async def unload_module(self, module_id: str):
         if module_id not in self.registry:
             return False
 
         self._teardown_ui(module_id)
+        # Drop the module's bus handlers so purged code is neither kept alive nor called
+        bus.unsubscribe_owner(module_id)
+        schema_migrations.unregister(module_id)
         entry = self.registry[module_id]
+        # Background tasks would keep running the purged code and hold their quota slots
+        await entry["context"].cancel_tasks()
 
         # --- VENDORING: Clean up the plugin's private dependency path ---
         if entry["manifest"].type == "PLUGIN":
@@ -462,7 +536,7 @@ class ModuleManager:
         is_plugin = entry["manifest"].type == "PLUGIN"
         module_folder = entry["module"].__name__.split('.')[-2]
 
-        self.unload_module(module_id)
+        await self.unload_module(module_id)
         importlib.invalidate_caches()
         await asyncio.sleep(0.1) # Brief pause to let things settle
         
@@ -510,12 +584,22 @@ class ModuleManager:
         if not desired:
             return
 
-        self._ensure_plugin_state_schema()
+        try:
+            await schema_migrations.upgrade()
+        except MigrationError as e:
+            log.error(f"RECONCILE: Skipping desired plugins, the core schema is not migrated: {e}")
+            return
 
         from .plugin_service import plugin_service
 
         log.info(f"RECONCILE: Checking {len(desired)} desired plugin(s)...")
 
+        # 1. Match every spec against the cached plugin states, record the desired
+        #    versions in one commit, and only then run the slow installs.
+        plan = []
+        if db_instance.AsyncSessionLocal:
+            await plugin_states.ensure_loaded()
+
         for spec in desired:
             url = spec["url"]
             version = spec["version"]
@@ -530,24 +614,23 @@ class ModuleManager:
 
             # Check DB state for auto_update preference
             should_update = settings.LYNDRIX_PLUGINS_AUTO_UPDATE
-            state = None
-            if db_instance.SessionLocal:
-                with db_instance.SessionLocal() as session:
-                    state = session.query(PluginState).filter(
-                        (PluginState.repo_url == url) |
-                        (PluginState.module_id.like(f"%{safe_name}%"))
-                    ).first()
-                    if state and state.auto_update is not None:
-                        should_update = state.auto_update
-                    if state:
-                        state.repo_url = url
-                        state.desired_version = version
-                        session.commit()
-
+            module_id = plugin_states.find(repo_url=url, name_fragment=safe_name)
+            state = plugin_states.get(module_id) if module_id else None
+            if state and state["auto_update"] is not None:
+                should_update = state["auto_update"]
+            if state:
+                plugin_states.stage(module_id, repo_url=url, desired_version=version)
+            plan.append((url, version, repo, plugin_path, should_update, state["installed_version"] if state else None))
+
+        if plugin_states.loaded:
+            await plugin_states.flush()
+
+        # 2. Install / update
+        for url, version, repo, plugin_path, should_update, installed_version in plan:
             if not plugin_path.exists():
                 log.info(f"RECONCILE: Installing missing desired plugin '{repo}' at '{version}'...")
                 await plugin_service.install_plugin(url, version=version)
-            elif version != "latest" and (not state or state.installed_version != version):
+            elif version != "latest" and installed_version != version:
                 log.info(f"RECONCILE: Updating desired plugin '{repo}' to pinned version '{version}'...")
                 await plugin_service.install_plugin(url, version=version, upgrade=True)
             elif version == "latest" and should_update:
@@ -558,34 +641,4 @@ class ModuleManager:
 
         log.info("RECONCILE: Desired plugin check complete.")
 
-    def _ensure_plugin_state_schema(self):
-        """Apply additive schema upgrades for plugin_states on existing installs."""
-        if self._plugin_state_schema_ready or not db_instance.engine:
-            return
-
-        required_columns = {
-            "installed_version": "VARCHAR(50) NULL",
-            "desired_version": "VARCHAR(50) NULL",
-            "repo_url": "VARCHAR(500) NULL",
-            "auto_update": "BOOLEAN DEFAULT 0",
-        }
-
-        with db_instance.engine.begin() as connection:
-            PluginState.__table__.create(bind=connection, checkfirst=True)
-            inspector = sqlalchemy_inspect(connection)
-            existing_columns = {
-                column["name"] for column in inspector.get_columns(PluginState.__tablename__)
-            }
-
-            for column_name, ddl in required_columns.items():
-                if column_name not in existing_columns:
-                    log.warning(
-                        f"PLUGIN_MANAGER: Migrating plugin_states table, adding column '{column_name}'."
-                    )
-                    connection.execute(
-                        text(f"ALTER TABLE {PluginState.__tablename__} ADD COLUMN {column_name} {ddl}")
-                    )
-
-        self._plugin_state_schema_ready = True
-
 module_manager = ModuleManager()
\ No newline at end of file
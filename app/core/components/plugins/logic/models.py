@@ -45,6 +45,10 @@ class ModuleManifest(BaseModel):
     auto_enable_on_install: bool = Field(default=True, description="Activate immediately after install")
     repo_url: Optional[str] = Field(default=None, description="Source repository URL for updates")
 
+    # --- Resource limits for ctx.create_task ---
+    max_concurrent_tasks: int = Field(default=16, ge=1, description="Tasks of this module running at the same time")
+    max_pending_tasks: int = Field(default=256, ge=0, description="Tasks waiting for a free slot before create_task rejects new ones")
+
 
 # ==========================================
 # 2. SQLALCHEMY MODELS (Persistent Storage)
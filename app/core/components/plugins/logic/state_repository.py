@@ -0,0 +1,161 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+from core.bus import bus
+from core.components.database.logic.db_service import db_instance
+from core.logger import get_logger
+from .models import PluginState
+
+log = get_logger("Core:PluginStates")
+
+_COLUMNS = ("is_active", "installed_version", "desired_version", "repo_url", "auto_update")
+_DEFAULTS = {"is_active": False, "installed_version": None, "desired_version": None,
+             "repo_url": None, "auto_update": False}
+
+
+class PluginStateRepository:
+    """
+    In-memory copy of the plugin_states table.
+
+    All rows are loaded with one query, and again after every 'db:connected';
+    in between, reads never touch the database. Writes are staged in a pending
+    overlay and only reach the cache once committed: save() returns after the
+    commit, and reads never report a state that was not persisted. Changes
+    staged or saved concurrently are written together as one multi-row upsert
+    in a single commit.
+    """
+
+    def __init__(self):
+        self._states: Dict[str, Dict[str, Any]] = {}
+        # module_id -> staged column values not yet committed
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self._flush_lock = asyncio.Lock()
+        bus.subscribe("db:connected")(self._on_db_connected)
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    async def load(self):
+        """(Re)reads all rows. Staged changes stay pending on top of the new copy."""
+        async with self._load_lock:
+            await self._load()
+
+    async def ensure_loaded(self):
+        if not self._loaded:
+            async with self._load_lock:
+                if not self._loaded:
+                    await self._load()
+
+    async def _load(self):
+        async with db_instance.AsyncSessionLocal() as session:
+            rows = (await session.execute(select(PluginState))).scalars().all()
+        self._states = {row.module_id: {column: getattr(row, column) for column in _COLUMNS} for row in rows}
+        self._loaded = True
+        log.debug(f"PLUGIN_STATES: Loaded {len(rows)} row(s).")
+
+    async def _on_db_connected(self, payload=None):
+        # Rows may have changed while disconnected (or in another worker): reload before the next read
+        if self._loaded:
+            self._loaded = False
+            await self.ensure_loaded()
+
+    # --- READS (RAM only, committed state) ---
+
+    def get(self, module_id: str) -> Optional[Dict[str, Any]]:
+        state = self._states.get(module_id)
+        return dict(state) if state is not None else None
+
+    def all(self) -> Dict[str, Dict[str, Any]]:
+        return {module_id: dict(state) for module_id, state in self._states.items()}
+
+    def find(self, repo_url: Optional[str] = None, name_fragment: Optional[str] = None) -> Optional[str]:
+        """Module id of the first state with this repo URL, else the first whose id contains the fragment."""
+        if repo_url:
+            for module_id, state in self._states.items():
+                if state["repo_url"] == repo_url:
+                    return module_id
+        if name_fragment:
+            fragment = name_fragment.lower()
+            for module_id in self._states:
+                if fragment in module_id.lower():
+                    return module_id
+        return None
+
+    # --- WRITES (write-through) ---
+
+    def stage(self, module_id: str, **values):
+        """Queues changes for the next flush(); reads see them once committed. Requires load()."""
+        unknown = set(values) - set(_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown plugin state column(s): {', '.join(sorted(unknown))}")
+        if not self._loaded:
+            raise RuntimeError("PluginStateRepository.stage() called before load()")
+        state = self._states.get(module_id)
+        pending = self._pending.get(module_id, {})
+        if state is not None:
+            changed = {column: value for column, value in values.items() if state[column] != value}
+            # A value staged back to the committed one cancels the pending change
+            pending = {column: value for column, value in pending.items() if column not in values}
+            values = changed
+        if values or pending:
+            self._pending[module_id] = {**pending, **values}
+        else:
+            self._pending.pop(module_id, None)
+
+    async def save(self, module_id: str, **values):
+        """Stages the changes and returns once they are committed.
+
+        If the write fails, these changes are dropped again so a later flush does
+        not persist what the caller was told had failed.
+        """
+        await self.ensure_loaded()
+        self.stage(module_id, **values)
+        try:
+            await self.flush()
+        except Exception:
+            self._discard(module_id, values)
+            raise
+
+    async def flush(self):
+        """Writes all staged rows in one upsert. Callers that queued behind a running flush
+        usually find their rows already written by it."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, {}
+            merged = {
+                module_id: {**self._states.get(module_id, _DEFAULTS), **changes}
+                for module_id, changes in batch.items()
+            }
+            rows: List[Dict[str, Any]] = [{"module_id": module_id, **state} for module_id, state in merged.items()]
+            statement = mysql_insert(PluginState).values(rows)
+            statement = statement.on_duplicate_key_update({column: statement.inserted[column] for column in _COLUMNS})
+            try:
+                async with db_instance.AsyncSessionLocal() as session:
+                    await session.execute(statement)
+                    await session.commit()
+            except Exception:
+                # The cache keeps the committed state; re-queue the changes (newer stages win) for the next flush
+                for module_id, changes in batch.items():
+                    self._pending[module_id] = {**changes, **self._pending.get(module_id, {})}
+                raise
+            self._states.update(merged)
+
+    def _discard(self, module_id: str, values: Dict[str, Any]):
+        pending = self._pending.get(module_id)
+        if pending is None:
+            return
+        for column, value in values.items():
+            if column in pending and pending[column] == value:
+                del pending[column]
+        if not pending:
+            del self._pending[module_id]
+
+
+plugin_states = PluginStateRepository()
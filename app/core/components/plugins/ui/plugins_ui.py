@@ -1,8 +1,14 @@
+import asyncio
+import logging
 import os
+import time
+from collections import deque
 
 from nicegui import ui
 
-from core.logger import get_logger, log_capture_buffer
+from core.log_search import log_search
+from core.log_stream import log_stream_hub
+from core.logger import get_logger, log_capture_store
 from ui.theme import UIStyles
 
 from ..logic.manager import module_manager
@@ -10,6 +16,11 @@ from ..logic.plugin_service import plugin_service
 
 log = get_logger("UI:Plugins")
 
+LIVE_LEVELS = {'DEBUG': logging.DEBUG, 'INFO': logging.INFO, 'WARNING': logging.WARNING,
+               'ERROR': logging.ERROR, 'CRITICAL': logging.CRITICAL}
+# Labels kept in the live log view before the oldest are removed
+LIVE_MAX_LINES = 1000
+
 PLUGIN_DIALOG_CLASSES = (
     f'w-[calc(100vw-40px)] h-[calc(100vh-40px)] max-w-none '
     f'max-h-none p-[20px] flex flex-col {UIStyles.MODAL_CONTAINER}'
@@ -69,6 +80,15 @@ def _safe_notify(message: str, notify_type: str = 'info'):
 
 def render_plugins_page():
     """Renders the full plugin management page."""
+    # Live log streams of this page's dialogs; one disconnect handler per client closes them all
+    open_streams = set()
+
+    def close_open_streams():
+        for stream in tuple(open_streams):
+            stream.close()
+        open_streams.clear()
+
+    ui.context.client.on_disconnect(close_open_streams)
 
     def collect_module_records():
         source_map = plugin_service.get_marketplace_source_map()
@@ -136,22 +156,149 @@ def render_plugins_page():
         else:
             _safe_notify(f'Deinstallation von {manifest.name} fehlgeschlagen.', 'negative')
 
+    def render_archive_search(target_logger):
+        """Paginated search over /app/logs (incl. rotated segments) for one logger."""
+        state = {'page': 0}
+        windows = {'1 h': 3600, '6 h': 6 * 3600, '24 h': 86400, '7 Tage': 7 * 86400, 'Alles': None}
+        levels = {'DEBUG': logging.DEBUG, 'INFO': logging.INFO, 'WARNING': logging.WARNING, 'ERROR': logging.ERROR}
+
+        with ui.row().classes('w-full items-center gap-2'):
+            level_select = ui.select(list(levels), value='WARNING', label='Level ≥').classes('w-32').props('dense outlined')
+            window_select = ui.select(list(windows), value='6 h', label='Zeitraum').classes('w-32').props('dense outlined')
+            text_input = ui.input(placeholder='Text enthält...').classes('flex-grow').props('dense outlined clearable')
+            search_button = ui.button(icon='search').props('flat round color=primary')
+        results = ui.scroll_area().classes('w-full flex-grow bg-black/50 rounded-xl p-4 font-mono text-xs')
+        with ui.row().classes('w-full items-center justify-between'):
+            prev_button = ui.button(icon='chevron_left').props('flat round dense')
+            page_label = ui.label().classes('text-xs text-zinc-500')
+            next_button = ui.button(icon='chevron_right').props('flat round dense')
+
+        async def run_search(page=0):
+            window = windows[window_select.value]
+            search_button.props('loading')
+            try:
+                # File scanning is blocking I/O; keep it off the event loop
+                result = await asyncio.get_running_loop().run_in_executor(None, lambda: log_search.search(
+                    logger_name=target_logger,
+                    min_level=levels[level_select.value],
+                    since=time.time() - window if window else None,
+                    text=text_input.value or None,
+                    page=page,
+                    page_size=100,
+                ))
+            except Exception as exc:
+                log.error(f"Plugins UI: archive log search failed: {exc}")
+                _safe_notify(f'Log-Suche fehlgeschlagen: {exc}', 'negative')
+                return
+            finally:
+                search_button.props(remove='loading')
+
+            state['page'] = page
+            results.clear()
+            with results:
+                if not result['items']:
+                    ui.label('Keine Einträge gefunden.').classes('text-zinc-600 italic')
+                for item in result['items']:
+                    color = 'text-red-500' if item['level'] in ['ERROR', 'CRITICAL'] else 'text-zinc-300'
+                    ui.label(f"{item['time']} | {item['level']:<8} | {item['message']}").classes(f'{color} whitespace-pre-wrap mb-1')
+            page_label.set_text(
+                f"Seite {page + 1} · {result['scanned_segments']} Segment(e) durchsucht, {result['skipped_segments']} übersprungen"
+            )
+            prev_button.set_enabled(page > 0)
+            next_button.set_enabled(result['has_more'])
+
+        search_button.on_click(lambda: run_search(0))
+        text_input.on('keydown.enter', lambda: run_search(0))
+        prev_button.on_click(lambda: run_search(max(0, state['page'] - 1)))
+        next_button.on_click(lambda: run_search(state['page'] + 1))
+        prev_button.set_enabled(False)
+        next_button.set_enabled(False)
+
     def open_logs(manifest):
         with ui.dialog() as log_dialog, ui.card().classes(f'w-full max-w-4xl h-[80vh] {UIStyles.MODAL_CONTAINER}'):
             with ui.row().classes('w-full justify-between items-center mb-4'):
                 ui.label(f'Logs: {manifest.name}').classes('text-xl font-bold font-mono text-emerald-500')
                 ui.button(icon='close', on_click=log_dialog.close).props('flat round dense')
 
-            log_container = ui.scroll_area().classes('w-full flex-grow bg-black/50 rounded-xl p-4 font-mono text-xs')
             target_logger = f"Plugin:{manifest.name}" if manifest.type == 'PLUGIN' else f"Core:{manifest.name}"
-            found_logs = [entry for entry in log_capture_buffer if entry[0] == target_logger]
 
-            with log_container:
-                if not found_logs:
-                    ui.label('Keine Logs gefunden.').classes('text-zinc-600 italic')
-                for _, level, message in found_logs:
-                    color = 'text-red-500' if level in ['ERROR', 'CRITICAL'] else 'text-zinc-300'
-                    ui.label(message).classes(f'{color} whitespace-pre-wrap mb-1')
+            with ui.tabs().classes('w-full') as log_tabs:
+                live_tab = ui.tab('Live')
+                archive_tab = ui.tab('Archiv')
+            with ui.tab_panels(log_tabs, value=live_tab).classes('w-full flex-grow bg-transparent'):
+                with ui.tab_panel(live_tab).classes('p-0 h-full flex flex-col gap-2'):
+                    with ui.row().classes('w-full items-center gap-2'):
+                        live_level = ui.select(list(LIVE_LEVELS), value='DEBUG', label='Level ≥').classes('w-32').props('dense outlined')
+                        live_text = ui.input(placeholder='Text enthält...').classes('flex-grow').props('dense outlined clearable debounce=300')
+                        dropped_label = ui.label().classes('text-xs text-amber-500')
+                    log_container = ui.scroll_area().classes('w-full flex-grow bg-black/50 rounded-xl p-4 font-mono text-xs')
+                with ui.tab_panel(archive_tab).classes('p-0 h-full flex flex-col gap-2'):
+                    render_archive_search(target_logger)
+
+            rendered = deque()
+            dropped_total = {'value': 0}
+
+            def render_entries(entries):
+                with log_container:
+                    for _, _, level, message in entries:
+                        color = 'text-red-500' if level in ['ERROR', 'CRITICAL'] else 'text-zinc-300'
+                        rendered.append(ui.label(message).classes(f'{color} whitespace-pre-wrap mb-1'))
+                # Keep the DOM bounded when a logger is chatty
+                while len(rendered) > LIVE_MAX_LINES:
+                    rendered.popleft().delete()
+
+            def on_lines(entries, dropped):
+                # Pushed by the log stream on the event loop, already filtered server-side
+                if dropped:
+                    dropped_total['value'] += dropped
+                    dropped_label.set_text(f"{dropped_total['value']} Zeilen übersprungen (Ratenlimit)")
+                if entries:
+                    empty_label.set_visibility(False)
+                    render_entries(entries)
+                    log_container.scroll_to(percent=1.0)
+
+            def current_filter():
+                return LIVE_LEVELS[live_level.value], (live_text.value or '').lower() or None
+
+            def show_snapshot(upto_seq):
+                min_level, text = current_filter()
+                snapshot = [
+                    entry for entry in log_capture_store.get(target_logger)
+                    if entry[0] <= upto_seq and LIVE_LEVELS.get(entry[2], 0) >= min_level and (not text or text in entry[3].lower())
+                ]
+                rendered.clear()
+                log_container.clear()
+                with log_container:
+                    label = ui.label('Keine Logs gefunden.').classes('text-zinc-600 italic')
+                    label.set_visibility(not snapshot)
+                render_entries(snapshot)
+                return label
+
+            # The snapshot covers everything up to snapshot_seq, the stream everything after it
+            snapshot_seq = log_capture_store.last_seq
+            empty_label = show_snapshot(snapshot_seq)
+            min_level, text = current_filter()
+            stream = log_stream_hub.open(
+                on_lines, logger_name=target_logger, min_level=min_level, text=text, after_seq=snapshot_seq,
+            )
+
+            def refilter():
+                nonlocal empty_label
+                min_level, text = current_filter()
+                snapshot_seq = log_capture_store.last_seq
+                stream.after_seq = snapshot_seq
+                stream.set_filter(min_level=min_level, text=text)
+                empty_label = show_snapshot(snapshot_seq)
+
+            live_level.on_value_change(refilter)
+            live_text.on_value_change(refilter)
+            open_streams.add(stream)
+
+            def close_stream():
+                stream.close()
+                open_streams.discard(stream)
+
+            log_dialog.on('hide', close_stream)
 
         log_dialog.open()
 
@@ -166,8 +313,8 @@ def render_plugins_page():
 
             with ui.scroll_area().classes('w-full flex-grow pr-4'):
                 with ui.column().classes('w-full gap-4'):
-                    def toggle_plugin_inner(event):
-                        module_manager.toggle_module(manifest.id, event.value)
+                    async def toggle_plugin_inner(event):
+                        await module_manager.toggle_module(manifest.id, event.value)
                         if event.value:
                             _safe_notify(f'{manifest.name} aktiviert.', 'positive')
                         else:
@@ -278,6 +425,24 @@ def render_plugins_page():
                                         ui.label(status_label).classes(f'text-[10px] font-bold px-2 py-1 rounded-full {status_classes}')
                                         if record['folder_name']:
                                             ui.label(record['folder_name']).classes('text-[10px] font-mono px-2 py-1 rounded-full bg-black/20 text-zinc-300')
+                                        if entry.get('context'):
+                                            task_label = ui.label().classes('text-[10px] font-mono px-2 py-1 rounded-full bg-black/20 text-zinc-300')
+                                            with task_label:
+                                                task_tooltip = ui.tooltip()
+
+                                            def refresh_task_label(label=task_label, tooltip=task_tooltip, ctx=entry['context']):
+                                                stats = ctx.task_stats()
+                                                label.set_text(f"Tasks {stats['running']}/{stats['max_concurrent']}"
+                                                               + (f" +{stats['waiting']} wartend" if stats['waiting'] else '')
+                                                               + (f" · {stats['failed']} Fehler" if stats['failed'] else ''))
+                                                label.classes(replace='text-[10px] font-mono px-2 py-1 rounded-full ' + (
+                                                    'bg-red-500/15 text-red-300' if stats['failed'] or stats['rejected'] else 'bg-black/20 text-zinc-300'))
+                                                tooltip.set_text(f"Laufend: {stats['running']}, wartend: {stats['waiting']}, "
+                                                              f"fertig: {stats['completed']}, fehlgeschlagen: {stats['failed']}, "
+                                                              f"abgebrochen: {stats['cancelled']}, abgelehnt: {stats['rejected']}")
+
+                                            refresh_task_label()
+                                            ui.timer(2.0, refresh_task_label)
 
                                     ui.label(manifest.description).classes('text-sm text-zinc-400 leading-relaxed min-h-[72px] flex-grow')
 
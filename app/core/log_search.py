@@ -0,0 +1,329 @@
+"""
+Search over the log file and its rotated segments.
+
+Every rotated segment is immutable, so it gets a small sidecar index (time
+range, per-logger record counts and highest level, level counts) in
+LOG_DIR/.index/. Queries skip segments the index rules out, and scan the rest
+by jumping between occurrences of the logger name (mmap for plain files)
+instead of parsing every line. Gzip segments are streamed line by line, so no
+segment is ever loaded whole.
+"""
+import gzip
+import json
+import logging
+import mmap
+import os
+import time
+from typing import Dict, Iterator, List, Optional
+
+from core.logger import DATE_FORMAT, LOG_DIR, LOG_FILE, get_logger
+
+log = get_logger("Core:LogSearch")
+
+INDEX_DIR = os.path.join(LOG_DIR, ".index")
+INDEX_VERSION = 1
+_LEVELS = {"CRITICAL": logging.CRITICAL, "ERROR": logging.ERROR, "WARNING": logging.WARNING,
+           "INFO": logging.INFO, "DEBUG": logging.DEBUG}
+
+
+def _level_value(levelname: str) -> int:
+    return _LEVELS.get(levelname.strip(), 0)
+
+
+class _ParsedLine:
+    __slots__ = ("ts", "time", "level", "logger", "text")
+
+    def __init__(self, ts: float, time_str: str, level: str, logger: str, text: str):
+        self.ts = ts
+        self.time = time_str
+        self.level = level
+        self.logger = logger
+        self.text = text
+
+    def as_dict(self) -> dict:
+        return {"ts": self.ts, "time": self.time, "level": self.level, "logger": self.logger, "message": self.text}
+
+
+class LogSearchService:
+    def __init__(self, log_file: str = LOG_FILE, index_dir: str = INDEX_DIR):
+        self.log_file = log_file
+        self.index_dir = index_dir
+        self._ts_cache: Dict[str, float] = {}
+
+    # --- SEGMENTS & INDEX ---
+
+    def segments(self) -> List[str]:
+        """Rotated segments plus the active file, newest first."""
+        base = os.path.basename(self.log_file)
+        directory = os.path.dirname(self.log_file)
+        try:
+            names = os.listdir(directory)
+        except FileNotFoundError:
+            return []
+        rotated = [
+            os.path.join(directory, name) for name in names
+            if name.startswith(f"{base}.") and not name.endswith(".tmp")
+        ]
+        rotated.sort(key=os.path.getmtime, reverse=True)
+        if os.path.exists(self.log_file):
+            rotated.insert(0, self.log_file)
+        return rotated
+
+    def _index_path(self, segment: str) -> str:
+        return os.path.join(self.index_dir, f"{os.path.basename(segment)}.json")
+
+    def get_index(self, segment: str) -> Optional[dict]:
+        """Loads or builds the sidecar index of a rotated segment (None for the active file)."""
+        if segment == self.log_file:
+            return None
+        stat = os.stat(segment)
+        path = self._index_path(segment)
+        try:
+            with open(path, encoding="utf-8") as handle:
+                index = json.load(handle)
+            if (index.get("version") == INDEX_VERSION and index.get("size") == stat.st_size
+                    and index.get("mtime") == stat.st_mtime):
+                return index
+        except (FileNotFoundError, ValueError):
+            pass
+
+        index = self._build_index(segment, stat)
+        os.makedirs(self.index_dir, exist_ok=True)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as handle:
+            json.dump(index, handle, separators=(",", ":"))
+        os.replace(f"{path}.tmp", path)
+        return index
+
+    def _build_index(self, segment: str, stat: os.stat_result) -> dict:
+        first_ts = last_ts = None
+        loggers: Dict[str, List[int]] = {}
+        levels: Dict[str, int] = {}
+        with self._open_buffer(segment) as buffer:
+            for line in self._iter_records(buffer, None):
+                if first_ts is None or line.ts < first_ts:
+                    first_ts = line.ts
+                if last_ts is None or line.ts > last_ts:
+                    last_ts = line.ts
+                stats = loggers.setdefault(line.logger, [0, 0])
+                stats[0] += 1
+                stats[1] = max(stats[1], _level_value(line.level))
+                levels[line.level] = levels.get(line.level, 0) + 1
+        return {
+            "version": INDEX_VERSION,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "first_ts": first_ts,
+            "last_ts": last_ts,
+            # logger -> [record count, highest level seen]
+            "loggers": loggers,
+            "levels": levels,
+        }
+
+    def prune_indexes(self):
+        """Deletes sidecar indexes whose segment was removed by retention."""
+        if not os.path.isdir(self.index_dir):
+            return
+        live = {os.path.basename(self._index_path(segment)) for segment in self.segments()}
+        for name in os.listdir(self.index_dir):
+            if name not in live:
+                try:
+                    os.remove(os.path.join(self.index_dir, name))
+                except OSError:
+                    pass
+
+    # --- SCANNING ---
+
+    class _Buffer:
+        """Context manager yielding an mmap (plain files) or a streaming gzip reader (.gz)."""
+
+        def __init__(self, path: str):
+            self.path = path
+            self._file = None
+            self._mmap = None
+
+        def __enter__(self):
+            if self.path.endswith(".gz"):
+                self._file = gzip.open(self.path, "rb")
+                return self._file
+            self._file = open(self.path, "rb")
+            if os.fstat(self._file.fileno()).st_size == 0:
+                return b""
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            return self._mmap
+
+        def __exit__(self, *exc):
+            if self._mmap is not None:
+                self._mmap.close()
+            if self._file is not None:
+                self._file.close()
+
+    def _open_buffer(self, path: str) -> "_Buffer":
+        return self._Buffer(path)
+
+    def _iter_records(self, buffer, needle: Optional[bytes]) -> Iterator[_ParsedLine]:
+        if isinstance(buffer, (bytes, mmap.mmap)):
+            return self._iter_lines(buffer, needle)
+        return self._iter_stream(buffer, needle)
+
+    def _iter_stream(self, handle, needle: Optional[bytes]) -> Iterator[_ParsedLine]:
+        """Same as _iter_lines for a file object read line by line (gzip segments)."""
+        pending = None
+        for raw in handle:
+            raw = raw.rstrip(b"\n")
+            if pending is not None and raw and not self._looks_like_record(raw):
+                pending.text += "\n" + raw.decode("utf-8", "replace")
+                continue
+            if pending is not None:
+                yield pending
+                pending = None
+            if needle is not None and needle not in raw:
+                continue
+            pending = self._parse(raw)
+        if pending is not None:
+            yield pending
+
+    def _iter_lines(self, buffer, needle: Optional[bytes]) -> Iterator[_ParsedLine]:
+        """Parsed records of a buffer in file order; with `needle`, only lines containing it.
+
+        Continuation lines (tracebacks) are appended to the preceding record.
+        """
+        size = len(buffer)
+        position = 0
+        while position < size:
+            if needle is not None:
+                hit = buffer.find(needle, position)
+                if hit < 0:
+                    return
+                start = buffer.rfind(b"\n", 0, hit) + 1
+            else:
+                start = position
+            end = buffer.find(b"\n", start)
+            if end < 0:
+                end = size
+            parsed = self._parse(buffer[start:end])
+            position = end + 1
+            if parsed is None:
+                continue
+            # Attach continuation lines (e.g. tracebacks in the text format)
+            while position < size:
+                next_end = buffer.find(b"\n", position)
+                if next_end < 0:
+                    next_end = size
+                following = buffer[position:next_end]
+                if not following or self._looks_like_record(following):
+                    break
+                parsed.text += "\n" + following.decode("utf-8", "replace")
+                position = next_end + 1
+            yield parsed
+
+    @staticmethod
+    def _looks_like_record(raw: bytes) -> bool:
+        return raw.startswith(b"{") or (len(raw) > 20 and raw[4:5] == b"-" and raw[19:22] == b" | ")
+
+    def _parse(self, raw: bytes) -> Optional[_ParsedLine]:
+        if not raw:
+            return None
+        if raw.startswith(b"{"):
+            try:
+                entry = json.loads(raw)
+            except ValueError:
+                return None
+            text = entry.get("msg", "")
+            if not isinstance(text, str):
+                text = json.dumps(text, ensure_ascii=False)
+            if entry.get("exc"):
+                text += "\n" + entry["exc"]
+            return _ParsedLine(entry.get("ts", 0.0), entry.get("time", ""), entry.get("level", ""),
+                               entry.get("logger", ""), text)
+
+        parts = raw.decode("utf-8", "replace").split(" | ", 3)
+        if len(parts) < 4:
+            return None
+        time_str, level, logger_name, text = parts
+        ts = self._ts_cache.get(time_str)
+        if ts is None:
+            try:
+                ts = time.mktime(time.strptime(time_str, DATE_FORMAT))
+            except ValueError:
+                # Lines written with a time-only format cannot be placed in time
+                return None
+            if len(self._ts_cache) > 100000:
+                self._ts_cache.clear()
+            self._ts_cache[time_str] = ts
+        return _ParsedLine(ts, time_str, level.strip(), logger_name.strip(), text)
+
+    # --- QUERY ---
+
+    def search(self, logger_name: Optional[str] = None, min_level: int = logging.DEBUG,
+               since: Optional[float] = None, until: Optional[float] = None, text: Optional[str] = None,
+               page: int = 0, page_size: int = 100) -> dict:
+        """Records matching all filters, newest first, one page at a time.
+
+        Blocking (file I/O): call from a thread when on the event loop.
+        """
+        if page == 0:
+            self.prune_indexes()
+        wanted = (page + 1) * page_size + 1
+        needle = logger_name.encode("utf-8") if logger_name else None
+        text_lower = text.lower() if text else None
+        matches: List[_ParsedLine] = []
+        scanned = skipped = 0
+
+        for segment in self.segments():
+            try:
+                if self._can_skip(self.get_index(segment), logger_name, min_level, since, until):
+                    skipped += 1
+                    continue
+                scanned += 1
+                segment_matches = []
+                with self._open_buffer(segment) as buffer:
+                    for line in self._iter_records(buffer, needle):
+                        if logger_name and line.logger != logger_name:
+                            continue
+                        if _level_value(line.level) < min_level:
+                            continue
+                        if (since is not None and line.ts < since) or (until is not None and line.ts > until):
+                            continue
+                        if text_lower and text_lower not in line.text.lower():
+                            continue
+                        segment_matches.append(line)
+            except (FileNotFoundError, OSError, EOFError) as e:
+                # Segment rotated away or pruned mid-search
+                log.debug(f"SEARCH: Skipping unreadable segment {segment}: {e}")
+                continue
+            matches.extend(reversed(segment_matches))
+            if len(matches) >= wanted:
+                break
+
+        items = matches[page * page_size:(page + 1) * page_size]
+        return {
+            "items": [line.as_dict() for line in items],
+            "page": page,
+            "page_size": page_size,
+            "has_more": len(matches) > (page + 1) * page_size,
+            "scanned_segments": scanned,
+            "skipped_segments": skipped,
+        }
+
+    @staticmethod
+    def _can_skip(index: Optional[dict], logger_name: Optional[str], min_level: int,
+                  since: Optional[float], until: Optional[float]) -> bool:
+        if index is None:
+            return False
+        if index.get("first_ts") is None:
+            return True
+        if since is not None and index["last_ts"] < since:
+            return True
+        if until is not None and index["first_ts"] > until:
+            return True
+        if logger_name:
+            stats = index["loggers"].get(logger_name)
+            if stats is None or stats[1] < min_level:
+                return True
+        elif min_level > logging.DEBUG:
+            if not any(_level_value(level) >= min_level for level in index["levels"]):
+                return True
+        return False
+
+
+log_search = LogSearchService()
@@ -0,0 +1,135 @@
+"""
+Live log streaming to UI clients.
+
+Each open log viewer registers a LogStream with server-side filters (logger,
+minimum level, text). New entries from log_capture_store are filtered on the
+logging thread, queued per stream and pushed to the viewer's callback on the
+event loop in small batches, capped at `max_lines_per_sec` per client. Lines
+beyond the cap are dropped (oldest first) and reported, so a log storm cannot
+flood a browser or the websocket.
+"""
+import asyncio
+import logging
+from collections import deque
+from typing import Callable, List, Optional, Set, Tuple
+
+from core.bus import bus
+from core.logger import get_logger, log_capture_store
+
+log = get_logger("Core:LogStream")
+
+_LEVELS = {"CRITICAL": logging.CRITICAL, "ERROR": logging.ERROR, "WARNING": logging.WARNING,
+           "INFO": logging.INFO, "DEBUG": logging.DEBUG}
+
+
+class LogStream:
+    def __init__(self, hub: "LogStreamHub", on_lines: Callable[[List[Tuple], int], None],
+                 logger_name: Optional[str], min_level: int, text: Optional[str],
+                 after_seq: int, max_lines_per_sec: int, interval: float, max_pending: int):
+        self.hub = hub
+        self.on_lines = on_lines
+        self.logger_name = logger_name
+        self.min_level = min_level
+        self.text = text.lower() if text else None
+        self.after_seq = after_seq
+        self.interval = interval
+        self.batch_size = max(1, int(max_lines_per_sec * interval))
+        self.dropped = 0
+        self.pushed = 0
+        self._pending: deque = deque(maxlen=max_pending)
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def matches(self, entry: Tuple) -> bool:
+        seq, name, levelname, text = entry
+        if seq <= self.after_seq:
+            return False
+        if self.logger_name and name != self.logger_name:
+            return False
+        if _LEVELS.get(levelname, 0) < self.min_level:
+            return False
+        return not self.text or self.text in text.lower()
+
+    def offer(self, entry: Tuple):
+        """Called on the logging thread for every new entry."""
+        if not self.matches(entry):
+            return
+        if len(self._pending) == self._pending.maxlen:
+            self.dropped += 1
+        was_empty = not self._pending
+        self._pending.append(entry)
+        if was_empty:
+            try:
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                # Loop already closed (shutdown)
+                pass
+
+    def set_filter(self, min_level: int = None, text: Optional[str] = ...):
+        if min_level is not None:
+            self.min_level = min_level
+        if text is not ...:
+            self.text = text.lower() if text else None
+        self._pending.clear()
+
+    async def _run(self):
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            lines = []
+            while self._pending and len(lines) < self.batch_size:
+                lines.append(self._pending.popleft())
+            # Lines still pending after a full batch are the ones beyond the rate cap
+            dropped, self.dropped = self.dropped, 0
+            if lines or dropped:
+                self.pushed += len(lines)
+                try:
+                    self.on_lines(lines, dropped)
+                except Exception as e:
+                    log.debug(f"STREAM: Viewer callback failed, closing stream: {e}")
+                    self.close()
+                    return
+            await asyncio.sleep(self.interval)
+
+    def close(self):
+        self.hub._streams.discard(self)
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+        self._task = None
+
+
+class LogStreamHub:
+    def __init__(self):
+        self._streams: Set[LogStream] = set()
+        self._attached = False
+
+    def open(self, on_lines: Callable[[List[Tuple], int], None], logger_name: Optional[str] = None,
+             min_level: int = logging.DEBUG, text: Optional[str] = None, after_seq: int = 0,
+             max_lines_per_sec: int = 50, interval: float = 0.25, max_pending: int = 500) -> LogStream:
+        """Starts pushing matching entries newer than `after_seq` to `on_lines(lines, dropped)`.
+
+        Must be called on the event loop; `on_lines` runs there too.
+        """
+        if not self._attached:
+            log_capture_store.add_listener(self._dispatch)
+            self._attached = True
+        stream = LogStream(self, on_lines, logger_name, min_level, text, after_seq,
+                           max_lines_per_sec, interval, max_pending)
+        self._streams.add(stream)
+        stream._task = bus.create_tracked_task(stream._run(), name=f"log_stream:{logger_name or '*'}")
+        return stream
+
+    def _dispatch(self, entry: Tuple):
+        for stream in tuple(self._streams):
+            stream.offer(entry)
+
+    def stats(self) -> dict:
+        return {
+            "clients": len(self._streams),
+            "pending": sum(len(stream._pending) for stream in self._streams),
+        }
+
+
+log_stream_hub = LogStreamHub()
@@ -1,10 +1,27 @@
+import atexit
+import copy
+import glob
+import gzip
 import logging
 import os
+import queue
+import shutil
 import sys
 import re
 import json
-from logging.handlers import RotatingFileHandler
-from collections import deque
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from collections import OrderedDict, deque
+from typing import List, Optional, Tuple
+
+# Optional fast serializer for JSON-lines logs
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
 
 # Pfade
 LOG_DIR = "/app/logs"
@@ -14,19 +31,114 @@ LOG_FILE = os.path.join(LOG_DIR, "lyndrix.log")
 IS_DEBUG = os.getenv("LYNDRIX_DEBUG", "false").lower() == "true"
 LOG_LEVEL = logging.DEBUG if IS_DEBUG else logging.INFO
 
+# Optional non-blocking mode: log calls only enqueue, a listener thread formats,
+# masks and writes. The queue is bounded; records beyond it are dropped and counted.
+USE_LOG_QUEUE = os.getenv("LYNDRIX_LOG_QUEUE", "false").lower() == "true"
+LOG_QUEUE_SIZE = int(os.getenv("LYNDRIX_LOG_QUEUE_SIZE", "10000"))
+
+# Log file: 'text' (human readable) or 'json' (one JSON object per line).
+# Rotated segments are gzip-compressed in the background and pruned by age and total size.
+LOG_FILE_FORMAT = os.getenv("LYNDRIX_LOG_FORMAT", "text").lower()
+LOG_MAX_BYTES = int(float(os.getenv("LYNDRIX_LOG_MAX_MB", "10")) * 1024 * 1024)
+LOG_RETENTION_DAYS = float(os.getenv("LYNDRIX_LOG_RETENTION_DAYS", "14"))
+LOG_MAX_TOTAL_BYTES = int(float(os.getenv("LYNDRIX_LOG_MAX_TOTAL_MB", "500")) * 1024 * 1024)
+LOG_COMPRESS = os.getenv("LYNDRIX_LOG_COMPRESS", "true").lower() == "true"
+
 # ENTERPRISE FORMATTING
 # [Zeit] | [Level] | [Komponente (25 Zeichen)] | Nachricht
 FORMAT_STR = "%(asctime)s | %(levelname)-8s | %(name)-25s | %(message)s"
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
-# Globaler Speicher für UI-Logs (Die letzten 1000 Einträge)
-# Wird von der UI abgefragt, um Logs pro Plugin zu filtern
-log_capture_buffer = deque(maxlen=1000)
+# Globaler Speicher für UI-Logs: die letzten N Einträge pro Logger
+LOG_CAPTURE_PER_LOGGER = int(os.getenv("LYNDRIX_LOG_CAPTURE_PER_LOGGER", "1000"))
+
+
+class LogCaptureStore:
+    """In-memory log capture with one bounded buffer per logger.
+
+    Every entry gets a global, monotonically increasing sequence number, so
+    viewers can tail incrementally with since(seq). A chatty logger only evicts
+    its own history. Entries are (seq, logger_name, levelname, text) tuples.
+    """
+
+    def __init__(self, per_logger: int = LOG_CAPTURE_PER_LOGGER, max_loggers: int = 500):
+        self.per_logger = per_logger
+        self.max_loggers = max_loggers
+        self._buffers: "OrderedDict[str, deque]" = OrderedDict()
+        self._seq = 0
+        self._lock = threading.Lock()
+        # Called with each new entry, on the thread that logged it (see core.log_stream)
+        self._listeners = []
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    def append(self, name: str, levelname: str, text: str) -> int:
+        with self._lock:
+            self._seq += 1
+            buffer = self._buffers.get(name)
+            if buffer is None:
+                buffer = self._buffers[name] = deque(maxlen=self.per_logger)
+                if len(self._buffers) > self.max_loggers:
+                    # Forget the logger that has been quiet the longest
+                    self._buffers.popitem(last=False)
+            else:
+                self._buffers.move_to_end(name)
+            entry = (self._seq, name, levelname, text)
+            buffer.append(entry)
+        for listener in self._listeners:
+            try:
+                listener(entry)
+            except Exception:
+                # A broken viewer must never break logging
+                pass
+        return entry[0]
+
+    def add_listener(self, listener):
+        self._listeners = [*self._listeners, listener]
+
+    def remove_listener(self, listener):
+        self._listeners = [l for l in self._listeners if l is not listener]
+
+    def get(self, name: str, limit: Optional[int] = None) -> List[Tuple]:
+        """Latest entries of one logger, oldest first."""
+        with self._lock:
+            entries = list(self._buffers.get(name, ()))
+        return entries[-limit:] if limit else entries
+
+    def since(self, seq: int, name: Optional[str] = None, limit: Optional[int] = None) -> List[Tuple]:
+        """Entries newer than `seq` (of one logger, or all loggers), oldest first."""
+        with self._lock:
+            buffers = [self._buffers[name]] if name in self._buffers else ([] if name else list(self._buffers.values()))
+            entries = []
+            for buffer in buffers:
+                # Buffers are ordered by seq: walk back from the newest entry
+                for index in range(len(buffer) - 1, -1, -1):
+                    if buffer[index][0] <= seq:
+                        break
+                    entries.append(buffer[index])
+        entries.sort()
+        return entries[-limit:] if limit else entries
+
+    def loggers(self) -> List[str]:
+        with self._lock:
+            return list(self._buffers)
+
+
+log_capture_store = LogCaptureStore()
 
 class EnterpriseFormatter(logging.Formatter):
     # Keys we NEVER want to see in plaintext in logs or UI
     SENSITIVE_KEYS = {'token', 'password', 'secret', 'secret_value', 'private_key', 'key', 'auth'}
-    
+    # One alternation for all keys (longest first, so 'secret_value' wins over 'secret').
+    # Matches "token: abc123", "token='abc123'", "x-gitlab-token: abc", etc.
+    SECRET_PATTERN = re.compile(
+        r"((?:" + "|".join(re.escape(k) for k in sorted(SENSITIVE_KEYS, key=len, reverse=True))
+        + r")['\" ]*[:=][ '\" ]*)([^ '\",\n]+)",
+        re.IGNORECASE,
+    )
+
     def _mask_secrets(self, obj):
         """Recursively hides sensitive values in dictionaries/lists."""
         if isinstance(obj, dict):
@@ -39,30 +151,248 @@ class EnterpriseFormatter(logging.Formatter):
         return obj
 
     def format(self, record):
+        # The same record passes through every handler (console, file, UI buffer);
+        # a formatter renders it once and reuses the result for the other handlers.
+        rendered = record.__dict__.setdefault("_lyndrix_formatted", {})
+        if self in rendered:
+            return rendered[self]
+
+        self._mask_record(record)
+        formatted = super().format(record)
+        rendered[self] = formatted
+        return formatted
+
+    def _mask_record(self, record):
+        """Masks record.msg in place, once per record regardless of how many handlers see it."""
+        if getattr(record, "_lyndrix_masked", False):
+            return
+        # Lazy %-style records (e.g. Event Bus lines) are rendered first so the
+        # payload text is masked as well, not just the template.
+        if record.args and isinstance(record.msg, str):
+            record.msg = record.getMessage()
+            record.args = None
+
         # If the message is a dictionary (common in our Event Bus logs)
         if isinstance(record.msg, dict):
             record.msg = self._mask_secrets(record.msg)
-            
-        # If it's a string, we can use a Regex to catch common token patterns
-        # Example: x-gitlab-token: [HIDDEN]
+        # If it's a string, a single regex pass masks every sensitive key
+        # Example: x-gitlab-token: ********
         elif isinstance(record.msg, str):
-            for key in self.SENSITIVE_KEYS:
-                # Matches "token: abc123", "token='abc123'", etc.
-                pattern = rf"({key}['\" ]*[:=][ '\" ]*)([^ '\",\n]+)"
-                record.msg = re.sub(pattern, r"\1********", record.msg, flags=re.IGNORECASE)
+            record.msg = self.SECRET_PATTERN.sub(r"\1********", record.msg)
+        record._lyndrix_masked = True
+
+
+class JsonLinesFormatter(EnterpriseFormatter):
+    """One JSON object per record: ts (epoch seconds), time, level, logger, msg and exc if any.
+
+    Uses the same secret masking as the text format.
+    """
+
+    def format(self, record):
+        rendered = record.__dict__.setdefault("_lyndrix_formatted", {})
+        if self in rendered:
+            return rendered[self]
+
+        self._mask_record(record)
+        entry = {
+            "ts": round(record.created, 3),
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.msg if isinstance(record.msg, (str, dict)) else str(record.msg),
+        }
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
 
-        return super().format(record)
+        if _ORJSON_AVAILABLE:
+            formatted = orjson.dumps(entry, default=str).decode("utf-8")
+        else:
+            formatted = json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=str)
+        rendered[self] = formatted
+        return formatted
+
+
+class CompressingRotatingFileHandler(RotatingFileHandler):
+    """Size-rotated log file whose segments are gzip-compressed off the logging path.
+
+    Rotated segments are named '<file>.<YYYYmmdd-HHMMSS>[.gz]'. A single background
+    thread compresses them and deletes segments older than `retention_days` or
+    beyond `max_total_bytes` (oldest first).
+    """
+
+    def __init__(self, filename, max_bytes: int, retention_days: float, max_total_bytes: int,
+                 compress: bool = True, encoding: str = "utf-8"):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=0, encoding=encoding)
+        self.retention_days = retention_days
+        self.max_total_bytes = max_total_bytes
+        self.compress = compress
+        self._maintenance = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-rotation")
+        # Segments left over by a previous run (e.g. killed mid-compression)
+        self._maintenance.submit(self._maintain, None)
+
+    def segments(self) -> List[str]:
+        """Rotated segments of this log file, oldest first."""
+        paths = [p for p in glob.glob(f"{self.baseFilename}.*") if not p.endswith(".tmp")]
+        return sorted(paths, key=os.path.getmtime)
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        rotated = None
+        if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            rotated = f"{self.baseFilename}.{stamp}"
+            suffix = 1
+            while os.path.exists(rotated) or os.path.exists(f"{rotated}.gz"):
+                rotated = f"{self.baseFilename}.{stamp}-{suffix}"
+                suffix += 1
+            os.rename(self.baseFilename, rotated)
+        if not self.delay:
+            self.stream = self._open()
+        if rotated:
+            self._maintenance.submit(self._maintain, rotated)
+
+    def _maintain(self, rotated: Optional[str]):
+        try:
+            if self.compress:
+                pending = [rotated] if rotated else [
+                    p for p in self.segments() if not p.endswith(".gz")
+                ]
+                for path in pending:
+                    self._compress(path)
+            self._prune()
+        except Exception as e:
+            # Never let housekeeping break logging; report on stderr like logging itself does
+            sys.stderr.write(f"LOGGING: Log rotation maintenance failed: {e}\n")
+
+    def _compress(self, path: str):
+        target = f"{path}.gz"
+        with open(path, "rb") as source, gzip.open(f"{target}.tmp", "wb", compresslevel=6) as sink:
+            shutil.copyfileobj(source, sink, 1024 * 1024)
+        os.replace(f"{target}.tmp", target)
+        # Keep the segment's original time so age-based retention and search stay correct
+        stat = os.stat(path)
+        os.utime(target, (stat.st_atime, stat.st_mtime))
+        os.remove(path)
+
+    def _prune(self):
+        segments = self.segments()
+        cutoff = time.time() - self.retention_days * 86400
+        kept = []
+        for path in segments:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+            else:
+                kept.append(path)
+        total = sum(os.path.getsize(path) for path in kept) + (
+            os.path.getsize(self.baseFilename) if os.path.exists(self.baseFilename) else 0
+        )
+        while kept and total > self.max_total_bytes:
+            oldest = kept.pop(0)
+            total -= os.path.getsize(oldest)
+            os.remove(oldest)
+
+    def close(self):
+        super().close()
+        self._maintenance.shutdown(wait=True)
 
 class RingBufferHandler(logging.Handler):
     """Speichert Logs im RAM für die UI-Anzeige."""
     def emit(self, record):
         log_entry = self.format(record)
-        log_capture_buffer.append((record.name, record.levelname, log_entry))
+        log_capture_store.append(record.name, record.levelname, log_entry)
+
+def _snapshot_arg(arg):
+    """Shallow copy of a mutable log argument; objects may provide their own snapshot()."""
+    if isinstance(arg, dict):
+        return dict(arg)
+    if isinstance(arg, list):
+        return list(arg)
+    snapshot = getattr(type(arg), "snapshot", None)
+    if snapshot is not None:
+        return snapshot(arg)
+    return arg
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler for a bounded queue: never blocks the caller, counts dropped records."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._unreported = 0
+        self._drop_lock = threading.Lock()
+
+    def prepare(self, record):
+        # Args (e.g. the bus's lazy event payloads) may be mutated by handlers before the
+        # listener renders them. They are snapshotted with shallow copies only; rendering,
+        # formatting and masking all stay on the listener thread.
+        record = copy.copy(record)
+        if isinstance(record.args, dict):
+            record.args = dict(record.args)
+        elif record.args:
+            record.args = tuple(_snapshot_arg(arg) for arg in record.args)
+        if isinstance(record.msg, dict):
+            record.msg = dict(record.msg)
+        return record
+
+    def enqueue(self, record):
+        with self._drop_lock:
+            unreported = self._unreported
+        if unreported:
+            notice = logging.LogRecord(
+                "Core:Logging", logging.WARNING, __file__, 0,
+                "LOGGING: Queue full, dropped %d record(s)", (unreported,), None
+            )
+            try:
+                self.queue.put_nowait(notice)
+                with self._drop_lock:
+                    self._unreported -= unreported
+            except queue.Full:
+                pass
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._drop_lock:
+                self.dropped += 1
+                self._unreported += 1
+
+
+_queue_listener = None
+_queue_handler = None
+
+
+def get_log_queue_stats() -> dict:
+    """Depth and drop counters of the logging queue (enabled False in direct mode)."""
+    if _queue_handler is None:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        "depth": _queue_handler.queue.qsize(),
+        "capacity": _queue_handler.queue.maxsize,
+        "dropped": _queue_handler.dropped,
+    }
+
+
+def _stop_queue_listener():
+    global _queue_listener, _queue_handler
+    if _queue_listener is not None:
+        # Flushes everything still queued before returning
+        _queue_listener.stop()
+        _queue_listener = None
+        _queue_handler = None
+
 
 def setup_logging():
+    global _queue_listener, _queue_handler
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.DEBUG)
 
+    _stop_queue_listener()
     if root_logger.hasHandlers():
         root_logger.handlers.clear()
 
@@ -76,8 +406,15 @@ def setup_logging():
     root_logger.addHandler(console_handler)
 
     # 2. FILE HANDLER
-    file_handler = RotatingFileHandler(LOG_FILE, maxBytes=10*1024*1024, backupCount=5, encoding="utf-8")
-    file_handler.setFormatter(formatter)
+    file_handler = CompressingRotatingFileHandler(
+        LOG_FILE, max_bytes=LOG_MAX_BYTES, retention_days=LOG_RETENTION_DAYS,
+        max_total_bytes=LOG_MAX_TOTAL_BYTES, compress=LOG_COMPRESS,
+    )
+    if LOG_FILE_FORMAT == "json":
+        file_handler.setFormatter(JsonLinesFormatter(datefmt=DATE_FORMAT))
+    else:
+        # Full date in the file so rotated segments can be searched by time
+        file_handler.setFormatter(EnterpriseFormatter(FORMAT_STR, datefmt=DATE_FORMAT))
     file_handler.setLevel(logging.DEBUG)
     root_logger.addHandler(file_handler)
 
@@ -87,6 +424,17 @@ def setup_logging():
     memory_handler.setLevel(logging.DEBUG)
     root_logger.addHandler(memory_handler)
 
+    # 4. OPTIONAL QUEUE: handlers move behind a listener thread
+    if USE_LOG_QUEUE:
+        sinks = list(root_logger.handlers)
+        root_logger.handlers.clear()
+        _queue_handler = DroppingQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+        _queue_handler.setLevel(logging.DEBUG)
+        root_logger.addHandler(_queue_handler)
+        _queue_listener = QueueListener(_queue_handler.queue, *sinks, respect_handler_level=True)
+        _queue_listener.start()
+        atexit.register(_stop_queue_listener)
+
     # Externe Logger dämpfen
     silent_loggers = ["uvicorn", "uvicorn.access", "sqlalchemy.engine", "hvac", "urllib3", "nicegui", "httpx"]
     for name in silent_loggers:
@@ -95,7 +443,10 @@ def setup_logging():
         l.propagate = False
         l.handlers = root_logger.handlers
 
-    logging.info(f"LOGGING: Initialized with level {'DEBUG' if IS_DEBUG else 'INFO'}")
+    logging.info(
+        f"LOGGING: Initialized with level {'DEBUG' if IS_DEBUG else 'INFO'}"
+        + (f" (queued, capacity {LOG_QUEUE_SIZE})" if USE_LOG_QUEUE else "")
+    )
 
 def get_logger(name: str):
     """Factory Methode für konsistente Logger-Namen."""
@@ -0,0 +1,53 @@
+import bisect
+from typing import Dict, List, Sequence
+
+# Default latency bucket upper bounds in milliseconds (last bucket is +Inf)
+DEFAULT_LATENCY_BUCKETS_MS = (0.1, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram; observe() is a bisect plus two increments."""
+    __slots__ = ("bounds", "counts", "count", "total_ms", "max_ms")
+
+    def __init__(self, bounds_ms: Sequence[float] = DEFAULT_LATENCY_BUCKETS_MS):
+        self.bounds = tuple(bounds_ms)
+        self.counts: List[int] = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, seconds: float):
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(self.bounds, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket containing the q-quantile (0 < q <= 1), capped at the max seen."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(self.bounds[index], self.max_ms) if index < len(self.bounds) else self.max_ms
+        return self.max_ms
+
+    def snapshot(self) -> Dict:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": round(self.percentile(0.5), 3),
+            "p95_ms": round(self.percentile(0.95), 3),
+            "p99_ms": round(self.percentile(0.99), 3),
+            "buckets": {
+                # counts has one more entry than bounds: the +Inf bucket, reported below
+                **{f"le_{bound}": count for bound, count in zip(self.bounds, self.counts[:-1], strict=True)},
+                "le_inf": self.counts[-1],
+            },
+        }
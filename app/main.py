@@ -1,12 +1,12 @@
 import os
 import sys
 from fastapi import FastAPI, Request
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, JSONResponse
 from nicegui import ui, app as nicegui_app 
 
 from config import settings
 from core.bus import bus
-from core.logger import setup_logging, get_logger
+from core.logger import setup_logging, get_logger, get_log_queue_stats
 
 # --- FIX: Load exclusively from the facade ---
 from core.services import vault_instance, db_instance, auth_service, boot_service
@@ -25,6 +25,14 @@ setup_logging()
 app = FastAPI()
 log = get_logger("Core:Main")
 
+bus.configure_execution(
+    offload_sync=settings.BUS_OFFLOAD_SYNC_HANDLERS,
+    max_workers=settings.BUS_SYNC_WORKERS,
+    slow_sync_budget=settings.BUS_SLOW_SYNC_HANDLER_MS / 1000,
+    slow_async_budget=settings.BUS_SLOW_ASYNC_HANDLER_MS / 1000,
+)
+bus.configure_lanes(low_share=settings.BUS_LOW_PRIORITY_SHARE, low_maxsize=settings.BUS_LOW_PRIORITY_QUEUE)
+
 
 def _safe_is_authenticated() -> bool:
     try:
@@ -83,6 +91,30 @@ def entry_point():
     else:
         ui.navigate.to('/login')
 
+# ==========================================
+# OBSERVABILITY API
+# ==========================================
+@app.get("/api/system/bus-metrics")
+async def bus_metrics():
+    """Per-topic emit counts, handler latency histograms and in-flight task gauge."""
+    if not _safe_is_authenticated():
+        return JSONResponse({"detail": "Not authenticated"}, status_code=401)
+    return bus.get_metrics()
+
+@app.get("/api/system/log-metrics")
+async def log_metrics():
+    """Logging queue depth and dropped-record counter (queued logging mode only)."""
+    if not _safe_is_authenticated():
+        return JSONResponse({"detail": "Not authenticated"}, status_code=401)
+    return {"queue": get_log_queue_stats()}
+
+@app.get("/api/system/db-metrics")
+async def db_metrics():
+    """Connection pool gauges and checkout wait-time histograms for the sync and async engines."""
+    if not _safe_is_authenticated():
+        return JSONResponse({"detail": "Not authenticated"}, status_code=401)
+    return db_instance.get_pool_stats()
+
 # ==========================================
 # SYSTEM START & REGISTRATION
 # ==========================================
@@ -92,9 +124,23 @@ register_settings_routes()
 register_vault_routes()
 register_dashboard_routes()
 
+bus_bridge = None
+
+
 @app.on_event("startup")
 async def startup_event():
+    global bus_bridge
     log.info("STARTUP: Lyndrix Core Engine is starting...")
+    if settings.BUS_BRIDGE_ENABLED:
+        from core.bus_bridge import BusBridge
+        bus_bridge = BusBridge(bus, settings.BUS_BRIDGE_SOCKET, settings.bus_bridge_topics)
+        await bus_bridge.start()
     bus.emit("system:started", {})
 
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if bus_bridge is not None:
+        await bus_bridge.stop()
+
 ui.run_with(app, storage_secret=settings.STORAGE_SECRET)
\ No newline at end of file
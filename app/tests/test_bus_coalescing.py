@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from core.bus import COALESCE_DEBOUNCE, COALESCE_LATEST, GlobalEventBus
+
+
+def _coalesced_bus(topic: str, **options):
+    bus = GlobalEventBus()
+    received = []
+    bus.subscribe(topic)(received.append)
+    bus.configure_coalescing(topic, **options)
+    return bus, received
+
+
+@pytest.mark.asyncio
+async def test_latest_mode_delivers_newest_payload_once_per_window():
+    bus, received = _coalesced_bus("t:refresh", window=0.05, mode=COALESCE_LATEST)
+    for i in range(5):
+        bus.emit("t:refresh", {"i": i})
+    assert received == []
+
+    await asyncio.sleep(0.1)
+    assert received == [{"i": 4}]
+    stats = bus.get_coalescing_stats()["t:refresh"]
+    assert (stats["received"], stats["delivered"]) == (5, 1)
+
+
+@pytest.mark.asyncio
+async def test_merge_combines_pending_payloads():
+    bus, received = _coalesced_bus(
+        "t:refresh", window=10, merge=lambda previous, current: {"n": previous["n"] + current["n"]},
+    )
+    for _ in range(3):
+        bus.emit("t:refresh", {"n": 1})
+    bus.flush_coalesced("t:refresh")
+
+    assert received == [{"n": 3}]
+
+
+@pytest.mark.asyncio
+async def test_debounce_waits_for_quiet_but_not_longer_than_max_wait():
+    bus, received = _coalesced_bus("t:refresh", window=0.05, mode=COALESCE_DEBOUNCE, max_wait=0.1)
+    # A steady stream never goes quiet for the window; max_wait still forces deliveries
+    for i in range(12):
+        bus.emit("t:refresh", {"i": i})
+        await asyncio.sleep(0.02)
+    during_burst = len(received)
+    await asyncio.sleep(0.1)
+
+    assert 1 <= during_burst < 12
+    assert received[-1] == {"i": 11}
+
+
+def test_without_running_loop_delivers_immediately():
+    bus, received = _coalesced_bus("t:refresh", window=10)
+    bus.emit("t:refresh", {"i": 1})
+
+    assert received == [{"i": 1}]
+
+
+@pytest.mark.asyncio
+async def test_remove_coalescing_flushes_pending_event():
+    bus, received = _coalesced_bus("t:refresh", window=10)
+    bus.emit("t:refresh", {"i": 1})
+    bus.remove_coalescing("t:refresh")
+    bus.emit("t:refresh", {"i": 2})
+
+    assert received == [{"i": 1}, {"i": 2}]
@@ -0,0 +1,73 @@
+import asyncio
+import copy
+
+import pytest
+
+from core.bus import GlobalEventBus, ReadOnlyMapping, ReadOnlySequence
+
+
+@pytest.mark.asyncio
+async def test_batch_subscriber_gets_whole_batch_in_one_call():
+    bus = GlobalEventBus()
+    batches, singles = [], []
+    bus.subscribe("t:items", batch=True)(batches.append)
+    bus.subscribe("t:items")(singles.append)
+
+    bus.emit_many("t:items", [{"i": 0}, {"i": 1}, {"i": 2}])
+    bus.emit("t:items", {"i": 3})
+
+    assert batches == [({"i": 0}, {"i": 1}, {"i": 2}), ({"i": 3},)]
+    assert singles == [{"i": 0}, {"i": 1}, {"i": 2}, {"i": 3}]
+
+
+@pytest.mark.asyncio
+async def test_async_subscriber_walks_batch_in_order():
+    bus = GlobalEventBus()
+    received = []
+
+    @bus.subscribe("t:items")
+    async def handler(payload):
+        await asyncio.sleep(0)
+        received.append(payload["i"])
+
+    bus.emit_many("t:items", ({"i": i} for i in range(5)))
+    await asyncio.sleep(0.05)
+
+    assert received == [0, 1, 2, 3, 4]
+
+
+def test_empty_batch_is_ignored():
+    bus = GlobalEventBus()
+    received = []
+    bus.subscribe("t:items", batch=True)(received.append)
+
+    bus.emit_many("t:items", [])
+
+    assert received == []
+    assert bus.get_metrics()["emits_total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_readonly_views_block_mutation_and_share_the_payload():
+    bus = GlobalEventBus()
+    received = []
+    bus.subscribe("t:items")(received.append)
+    payload = {"host": "a", "tags": ["x"], "meta": {"k": 1}}
+
+    bus.emit_many("t:items", [payload], readonly=True)
+    view = received[0]
+
+    assert isinstance(view, ReadOnlyMapping)
+    assert isinstance(view["tags"], ReadOnlySequence)
+    assert isinstance(view["meta"], ReadOnlyMapping)
+    with pytest.raises(TypeError):
+        view["host"] = "b"
+    with pytest.raises(TypeError):
+        view["meta"]["k"] = 2
+    assert view == payload
+
+    mutable = view.copy()
+    mutable["host"] = "b"
+    independent = copy.deepcopy(view)
+    independent["meta"]["k"] = 2
+    assert payload == {"host": "a", "tags": ["x"], "meta": {"k": 1}}
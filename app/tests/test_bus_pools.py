@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from core.bus import OVERFLOW_BLOCK, OVERFLOW_DROP_NEWEST, OVERFLOW_DROP_OLDEST, GlobalEventBus
+
+
+def _pooled_bus(topic: str, overflow: str, maxsize: int = 2):
+    bus = GlobalEventBus()
+    received = []
+    bus.subscribe(topic)(lambda payload: received.append(payload["i"]))
+    bus.configure_pool(topic, workers=1, maxsize=maxsize, overflow=overflow)
+    return bus, received
+
+
+async def _drain(bus: GlobalEventBus, topic: str):
+    await bus._pools[topic].queue.join()
+    bus.remove_pool(topic)
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_keeps_the_newest_events():
+    bus, received = _pooled_bus("t:burst", OVERFLOW_DROP_OLDEST)
+    for i in range(5):
+        bus.emit("t:burst", {"i": i})
+    stats = bus.get_pool_stats()["t:burst"]
+    await _drain(bus, "t:burst")
+
+    assert received == [3, 4]
+    assert stats["dropped"] == 3
+
+
+@pytest.mark.asyncio
+async def test_drop_newest_keeps_the_oldest_events():
+    bus, received = _pooled_bus("t:burst", OVERFLOW_DROP_NEWEST)
+    for i in range(5):
+        bus.emit("t:burst", {"i": i})
+    stats = bus.get_pool_stats()["t:burst"]
+    await _drain(bus, "t:burst")
+
+    assert received == [0, 1]
+    assert stats["dropped"] == 3
+
+
+@pytest.mark.asyncio
+async def test_block_waits_for_space_with_emit_async():
+    bus, received = _pooled_bus("t:burst", OVERFLOW_BLOCK, maxsize=1)
+    for i in range(5):
+        await bus.emit_async("t:burst", {"i": i})
+    stats = bus.get_pool_stats()["t:burst"]
+    await _drain(bus, "t:burst")
+
+    assert received == [0, 1, 2, 3, 4]
+    assert stats["dropped"] == 0
+
+
+@pytest.mark.asyncio
+async def test_block_drops_on_sync_emit_when_full():
+    # A synchronous emit() cannot wait for space, so 'block' degrades to dropping
+    bus, received = _pooled_bus("t:burst", OVERFLOW_BLOCK, maxsize=1)
+    for i in range(3):
+        bus.emit("t:burst", {"i": i})
+    stats = bus.get_pool_stats()["t:burst"]
+    await _drain(bus, "t:burst")
+
+    assert received == [0]
+    assert stats["dropped"] == 2
+
+
+def test_pooled_topic_without_running_loop_dispatches_directly():
+    bus, received = _pooled_bus("t:burst", OVERFLOW_DROP_OLDEST)
+    bus.emit("t:burst", {"i": 1})
+
+    assert received == [1]
+    assert bus.get_pool_stats()["t:burst"]["depth"] == 0
+
+
+def test_unknown_overflow_policy_is_rejected():
+    with pytest.raises(ValueError):
+        GlobalEventBus().configure_pool("t:burst", overflow="spill")
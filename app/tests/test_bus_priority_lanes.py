@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+import pytest
+
+from core.bus import CRITICAL_MAX_WAIT_SECONDS, PRIORITY_CRITICAL, PRIORITY_LOW, GlobalEventBus
+
+
+@pytest.mark.asyncio
+async def test_low_priority_events_are_queued_not_dispatched_inline():
+    bus = GlobalEventBus()
+    bus.set_priority("t:telemetry", PRIORITY_LOW)
+    received = []
+    bus.subscribe("t:telemetry")(lambda payload: received.append(payload["i"]))
+
+    for i in range(3):
+        bus.emit("t:telemetry", {"i": i})
+    assert received == []
+
+    await asyncio.sleep(0.05)
+    assert received == [0, 1, 2]
+    assert bus.get_lane_stats()["low"]["processed"] == 3
+
+
+@pytest.mark.asyncio
+async def test_low_lane_waits_only_briefly_for_long_critical_handlers():
+    bus = GlobalEventBus()
+    bus.set_priority("t:critical", PRIORITY_CRITICAL)
+    bus.set_priority("t:telemetry", PRIORITY_LOW)
+    delivered_at = []
+
+    @bus.subscribe("t:critical")
+    async def slow_critical(payload):
+        await asyncio.sleep(0.5)
+
+    bus.subscribe("t:telemetry")(lambda payload: delivered_at.append(time.monotonic()))
+
+    started = time.monotonic()
+    bus.emit("t:critical")
+    bus.emit("t:telemetry")
+    await asyncio.sleep(0.2)
+
+    # Delivered while the critical handler was still running, after at most the capped wait
+    assert bus.get_lane_stats()["critical_in_flight"] == 1
+    assert len(delivered_at) == 1
+    assert delivered_at[0] - started < CRITICAL_MAX_WAIT_SECONDS + 0.1
+    await asyncio.sleep(0.35)
+
+
+@pytest.mark.asyncio
+async def test_low_lane_drops_oldest_when_full():
+    bus = GlobalEventBus()
+    bus.set_priority("t:telemetry", PRIORITY_LOW)
+    bus.configure_lanes(low_maxsize=2)
+    received = []
+    bus.subscribe("t:telemetry")(lambda payload: received.append(payload["i"]))
+
+    for i in range(5):
+        bus.emit("t:telemetry", {"i": i})
+    await asyncio.sleep(0.05)
+
+    assert received == [3, 4]
+    assert bus.get_lane_stats()["low"]["dropped"] == 3
+
+
+def test_exact_topic_wins_over_pattern():
+    bus = GlobalEventBus()
+    bus.set_priority("t:**", PRIORITY_LOW)
+    bus.set_priority("t:alert", PRIORITY_CRITICAL)
+
+    assert bus._priority_of("t:alert") == PRIORITY_CRITICAL
+    assert bus._priority_of("t:other") == PRIORITY_LOW
+
+
+def test_unknown_lane_is_rejected():
+    with pytest.raises(ValueError):
+        GlobalEventBus().set_priority("t:x", "urgent")
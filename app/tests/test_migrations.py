@@ -0,0 +1,163 @@
+import types
+
+import pytest
+
+from core.components.database.logic import migrations
+from core.components.database.logic.db_service import db_instance
+from core.components.database.logic.migrations import (
+    RETRY_BACKOFF_INITIAL,
+    UNOWNED_COMPONENT,
+    Migration,
+    MigrationError,
+    MigrationRunner,
+)
+
+
+class _FakeConnection:
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class _FakeEngine:
+    """Stands in for the async engine: run_sync() calls straight through."""
+
+    def __init__(self):
+        self.connection = _FakeConnection()
+
+    def connect(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def run_sync(self, function):
+        return function(self.connection)
+
+
+class _FlakyStep:
+    """Migration step that fails the first `failures` times it runs."""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self, connection):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("lost connection during migration")
+
+
+@pytest.fixture
+def versions():
+    """Contents of the schema_versions table: component -> (version, fingerprint)."""
+    return {}
+
+
+@pytest.fixture
+def runner(monkeypatch, versions):
+    """A MigrationRunner whose schema_versions table is the `versions` dict."""
+    monkeypatch.setattr(db_instance, "async_engine", _FakeEngine())
+    monkeypatch.setattr(MigrationRunner, "_read_versions", staticmethod(lambda connection: dict(versions)))
+    monkeypatch.setattr(
+        MigrationRunner, "_write_version",
+        staticmethod(lambda connection, component, version, fingerprint: versions.__setitem__(component, (version, fingerprint))),
+    )
+    runner = MigrationRunner()
+    # Pretend the tables without migrations are already created
+    versions[UNOWNED_COMPONENT] = runner._unowned_target()
+    return runner
+
+
+@pytest.mark.asyncio
+async def test_steps_run_once_in_order(runner, versions):
+    calls = []
+    runner.register("plugin.notes", [
+        Migration(2, "add pinned flag", lambda connection: calls.append(2)),
+        Migration(1, "create notes table", lambda connection: calls.append(1)),
+    ])
+
+    await runner.upgrade()
+    await runner.upgrade()
+
+    assert calls == [1, 2]
+    assert versions["plugin.notes"][0] == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_core_component_raises_until_retry_succeeds(runner, versions):
+    step = _FlakyStep(failures=1)
+    runner.register("core.plugins", [Migration(1, "create plugin_states", step)])
+
+    with pytest.raises(MigrationError):
+        await runner.upgrade()
+    assert "core.plugins" in runner.failed
+    assert "core.plugins" not in versions
+
+    # Within the backoff the step is not retried and the failure is still reported
+    with pytest.raises(MigrationError):
+        await runner.upgrade()
+    assert step.calls == 1
+
+    runner.retry_failed()
+    await runner.upgrade()
+    assert step.calls == 2
+    assert runner.failed == {}
+    assert versions["core.plugins"][0] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_plugin_component_does_not_raise(runner):
+    runner.register("plugin.notes", [Migration(1, "create notes table", _FlakyStep(failures=1))])
+
+    await runner.upgrade()
+
+    assert "plugin.notes" in runner.failed
+
+
+@pytest.mark.asyncio
+async def test_retry_after_backoff_and_backoff_doubles(runner, monkeypatch):
+    step = _FlakyStep(failures=2)
+    runner.register("plugin.notes", [Migration(1, "create notes table", step)])
+    now = [1000.0]
+    # Only the runner's clock: patching time.monotonic itself would also freeze the event loop
+    monkeypatch.setattr(migrations, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+
+    await runner.upgrade()
+    assert runner._retry_at["plugin.notes"] == (now[0] + RETRY_BACKOFF_INITIAL, RETRY_BACKOFF_INITIAL)
+
+    now[0] += RETRY_BACKOFF_INITIAL
+    await runner.upgrade()
+    assert step.calls == 2
+    assert runner._retry_at["plugin.notes"][1] == RETRY_BACKOFF_INITIAL * 2
+
+    now[0] += RETRY_BACKOFF_INITIAL * 2
+    await runner.upgrade()
+    assert step.calls == 3
+    assert "plugin.notes" not in runner.failed
+
+
+@pytest.mark.asyncio
+async def test_db_connected_makes_failed_components_due(runner):
+    step = _FlakyStep(failures=1)
+    runner.register("plugin.notes", [Migration(1, "create notes table", step)])
+    await runner.upgrade()
+
+    await runner._on_db_connected()
+    await runner.upgrade()
+
+    assert step.calls == 2
+    assert runner.failed == {}
+
+
+def test_duplicate_versions_are_rejected():
+    with pytest.raises(ValueError):
+        MigrationRunner().register("plugin.notes", [
+            Migration(1, "a", lambda connection: None),
+            Migration(1, "b", lambda connection: None),
+        ])
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from core.components.plugins.logic.context import ModuleContext, TaskQuotaExceeded
+from core.components.plugins.logic.models import ModuleManifest
+
+
+def _context(max_concurrent: int = 1, max_pending: int = 1) -> ModuleContext:
+    manifest = ModuleManifest(
+        id="lyndrix.plugin.quota_test", name="quota_test", version="1.0.0",
+        max_concurrent_tasks=max_concurrent, max_pending_tasks=max_pending,
+    )
+    return ModuleContext(manifest)
+
+
+@pytest.mark.asyncio
+async def test_tasks_beyond_concurrency_limit_wait_for_a_slot():
+    ctx = _context(max_concurrent=1, max_pending=2)
+    release = asyncio.Event()
+
+    async def work():
+        await release.wait()
+
+    tasks = [ctx.create_task(work()) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert (ctx.task_stats()["running"], ctx.task_stats()["waiting"]) == (1, 2)
+
+    release.set()
+    await asyncio.gather(*tasks)
+    stats = ctx.task_stats()
+    assert (stats["running"], stats["waiting"], stats["completed"]) == (0, 0, 3)
+
+
+@pytest.mark.asyncio
+async def test_create_task_rejects_beyond_pending_limit():
+    ctx = _context(max_concurrent=1, max_pending=1)
+    release = asyncio.Event()
+
+    async def work():
+        await release.wait()
+
+    tasks = [ctx.create_task(work()) for _ in range(2)]
+    rejected = work()
+    with pytest.raises(TaskQuotaExceeded):
+        ctx.create_task(rejected)
+    # The rejected coroutine is closed, not left un-awaited
+    assert rejected.cr_frame is None
+    assert ctx.task_stats()["rejected"] == 1
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiting_tasks_release_their_quota():
+    ctx = _context(max_concurrent=1, max_pending=1)
+    release = asyncio.Event()
+
+    async def work():
+        await release.wait()
+
+    running = ctx.create_task(work())
+    waiting = ctx.create_task(work())
+    await asyncio.sleep(0)
+    waiting.cancel()
+    await asyncio.gather(waiting, return_exceptions=True)
+
+    stats = ctx.task_stats()
+    assert (stats["waiting"], stats["cancelled"]) == (0, 1)
+    release.set()
+    await running
+
+
+@pytest.mark.asyncio
+async def test_cancel_tasks_stops_running_and_waiting_tasks():
+    ctx = _context(max_concurrent=1, max_pending=2)
+
+    async def work():
+        await asyncio.sleep(10)
+
+    for _ in range(3):
+        ctx.create_task(work())
+    await asyncio.sleep(0)
+
+    assert await ctx.cancel_tasks() == 3
+    stats = ctx.task_stats()
+    assert (stats["running"], stats["waiting"], stats["cancelled"]) == (0, 0, 3)
+    # The freed slot is usable again
+    assert await ctx.create_task(asyncio.sleep(0, result="done")) == "done"
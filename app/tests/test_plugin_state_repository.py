@@ -0,0 +1,137 @@
+import pytest
+from sqlalchemy.sql import Select
+
+from core.components.database.logic.db_service import db_instance
+from core.components.plugins.logic.models import PluginState
+from core.components.plugins.logic.state_repository import PluginStateRepository
+
+
+class _FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return list(self._rows)
+
+
+class _FakeDatabase:
+    """Stands in for AsyncSessionLocal: serves `rows` to selects and counts upserts."""
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.fail = False
+        self.writes = 0
+
+    def __call__(self):
+        return _FakeSession(self)
+
+
+class _FakeSession:
+    def __init__(self, database: _FakeDatabase):
+        self.database = database
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, statement):
+        if self.database.fail:
+            raise ConnectionError("database unavailable")
+        if isinstance(statement, Select):
+            return _FakeResult(self.database.rows)
+        self.database.writes += 1
+
+    async def commit(self):
+        pass
+
+
+def _row(module_id: str, **values) -> PluginState:
+    return PluginState(module_id=module_id, **{
+        "is_active": False, "installed_version": "1.0.0", "desired_version": "1.0.0",
+        "repo_url": None, "auto_update": False, **values,
+    })
+
+
+@pytest.fixture
+def database(monkeypatch):
+    fake = _FakeDatabase([_row("plugin.a")])
+    monkeypatch.setattr(db_instance, "AsyncSessionLocal", fake)
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_save_updates_cache_after_commit(database):
+    repository = PluginStateRepository()
+    await repository.save("plugin.a", is_active=True)
+
+    assert repository.get("plugin.a")["is_active"] is True
+    assert database.writes == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_save_keeps_committed_state(database):
+    repository = PluginStateRepository()
+    await repository.load()
+    database.fail = True
+
+    with pytest.raises(ConnectionError):
+        await repository.save("plugin.a", is_active=True)
+
+    assert repository.get("plugin.a")["is_active"] is False
+    # Nothing left queued: a later flush must not persist what the caller was told failed
+    database.fail = False
+    await repository.flush()
+    assert database.writes == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_requeues_staged_rows(database):
+    repository = PluginStateRepository()
+    await repository.load()
+    repository.stage("plugin.b", is_active=True)
+    database.fail = True
+
+    with pytest.raises(ConnectionError):
+        await repository.flush()
+    assert repository.get("plugin.b") is None
+
+    database.fail = False
+    await repository.flush()
+    assert repository.get("plugin.b")["is_active"] is True
+    assert database.writes == 1
+
+
+@pytest.mark.asyncio
+async def test_staging_the_committed_value_cancels_the_pending_change(database):
+    repository = PluginStateRepository()
+    await repository.load()
+    repository.stage("plugin.a", is_active=True)
+    repository.stage("plugin.a", is_active=False)
+
+    await repository.flush()
+    assert database.writes == 0
+
+
+@pytest.mark.asyncio
+async def test_reconnect_reloads_rows_changed_elsewhere(database):
+    repository = PluginStateRepository()
+    await repository.load()
+    database.rows = [_row("plugin.a", is_active=True), _row("plugin.c")]
+
+    await repository._on_db_connected()
+
+    assert repository.get("plugin.a")["is_active"] is True
+    assert repository.get("plugin.c") is not None
+
+
+def test_stage_validates_columns_and_requires_load():
+    repository = PluginStateRepository()
+    with pytest.raises(ValueError):
+        repository.stage("plugin.a", color="red")
+    with pytest.raises(RuntimeError):
+        repository.stage("plugin.a", is_active=True)
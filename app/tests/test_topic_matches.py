@@ -0,0 +1,33 @@
+import pytest
+
+from core.bus import GlobalEventBus, topic_matches
+
+
+def test_single_wildcard_matches_one_segment():
+    assert topic_matches("plugin:*", "plugin:installed")
+    assert not topic_matches("plugin:*", "plugin:a:b")
+
+
+def test_rest_wildcard_covers_any_depth():
+    assert topic_matches("plugin:**", "plugin:a:b:c")
+    assert topic_matches("plugin:**", "plugin:*")
+    assert topic_matches("plugin:**", "plugin:**")
+
+
+def test_single_wildcard_rule_does_not_cover_rest_wildcard_request():
+    # Regression: a 'plugin:*' permission must not grant a 'plugin:**' subscription
+    assert not topic_matches("plugin:*", "plugin:**")
+    assert not topic_matches("*:*", "plugin:**")
+    assert topic_matches("plugin:*", "plugin:*")
+
+
+def test_rest_wildcard_must_be_last_segment_for_subscriptions():
+    # Regression: 'a:**:b' used to be indexed like 'a:**' while topic_matches() treated it differently
+    bus = GlobalEventBus()
+    with pytest.raises(ValueError):
+        bus.subscribe("plugin:**:installed")
+    with pytest.raises(ValueError):
+        bus._pattern_trie.add("**:x", lambda payload: None)
+
+    bus.subscribe("plugin:**")(lambda payload: None)
+    assert len(bus._resolve("plugin:a:b")) == 1